@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+import os
+os.environ["PYGAME_HIDE_SUPPORT_PROMPT"] = "1"
+import argparse
+import contextlib
+import io
+import time
+from config import Config
+from core.rules import Rules
+from core.minmax import Minimax
+from core.move import Move
+from ui.stones import Stones
+
+
+# Standard positions: (name, board size, rules, moves alternating black/white)
+POSITIONS = [
+	("opening-15", 15, "standard", [(7, 7), (8, 8), (8, 7), (6, 7)]),
+	("midgame-15", 15, "standard", [(7, 7), (8, 8), (8, 7), (6, 7), (9, 7), (10, 7), (8, 6), (8, 9), (9, 8), (6, 5)]),
+	("open-three-19", 19, "standard", [(9, 9), (10, 10), (9, 10), (10, 9), (9, 11), (3, 3)]),
+	("capture-19", 19, "ninuki", [(9, 9), (10, 9), (11, 9), (9, 10), (10, 10), (11, 11), (8, 8), (12, 12)]),
+	("midgame-19", 19, "standard", [(9, 9), (9, 10), (8, 8), (7, 7), (9, 11), (10, 10), (11, 10), (7, 9),
+	                                (7, 10), (10, 11), (7, 8), (9, 8), (6, 8), (5, 8)]),
+]
+
+
+def make_cfg(size, difficulty, overrides):
+	cfg = Config()
+	cfg.board.size = size
+	cfg.game.difficulty = difficulty
+	cfg.game.noDoubleThrees = False
+	for key, value in overrides.items():
+		setattr(cfg.game, key, value)
+	return cfg
+
+
+def setup(name, size, difficulty, moves, overrides):
+	cfg = make_cfg(size, difficulty, overrides)
+	rules = Rules(cfg)
+	stones = Stones(cfg)
+	colours = [cfg.game.player1Colour, cfg.game.player2Colour]
+	last_move = None
+	for i, tile in enumerate(moves):
+		last_move = Move(tile, colours[i % 2])
+		captures = rules.previewCaptures(stones, last_move)
+		stones.make(last_move, captures)
+	to_move = colours[len(moves) % 2]
+	opponent = colours[(len(moves) + 1) % 2]
+	return cfg, rules, stones, last_move, to_move, opponent
+
+
+def run_position(position, depth, overrides):
+	name, size, difficulty, moves = position
+	cfg, rules, stones, last_move, to_move, opponent = setup(name, size, difficulty, moves, overrides)
+	minimax = Minimax(cfg, rules, to_move, opponent)
+
+	start = time.perf_counter()
+	with contextlib.redirect_stdout(io.StringIO()):
+		score, tile = minimax.search(stones, last_move, time_budget=float('inf'), max_depth=depth)
+	elapsed = time.perf_counter() - start
+	return score, tile, elapsed, minimax
+
+
+def parse_overrides(pairs):
+	overrides = {}
+	for pair in pairs:
+		key, value = pair.split("=", 1)
+		if value in ["True", "False"]:
+			overrides[key] = value == "True"
+		elif "," in value:
+			overrides[key] = tuple(int(v) for v in value.split(",") if v)
+		else:
+			try:
+				overrides[key] = int(value)
+			except ValueError:
+				try:
+					overrides[key] = float(value)
+				except ValueError:
+					overrides[key] = value
+	return overrides
+
+
+def main():
+	parser = argparse.ArgumentParser(description="Search benchmark on fixed positions")
+	parser.add_argument("--depth", type=int, default=4, help="fixed search depth")
+	parser.add_argument("--set", nargs="*", default=[], metavar="KEY=VALUE",
+	                    help="GameConfig overrides, e.g. aiMoveOrdering=False or aiBeamWidths=20,10")
+	args = parser.parse_args()
+	overrides = parse_overrides(args.set)
+
+	total_nodes = 0
+	total_time = 0.0
+	for position in POSITIONS:
+		score, tile, elapsed, minimax = run_position(position, args.depth, overrides)
+		total_nodes += minimax.nodes
+		total_time += elapsed
+		print(f"{position[0]:<16} move {tile} score {score} time {elapsed:.2f}s | {minimax.report()}")
+	print(f"{'total':<16} nodes {total_nodes} time {total_time:.2f}s")
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+import os
+os.environ["PYGAME_HIDE_SUPPORT_PROMPT"] = "1"
+import argparse
+import contextlib
+import io
+from config import Config
+from core.rules import Rules
+from core.minmax import Minimax
+from core.move import Move
+from core.book import bookPath, makeRecord, positionKey, writeBook
+from ui.stones import Stones
+
+
+# Builds the opening books with the engine itself: starting from the empty
+# board, every position is searched and its best move recorded, then the
+# best move and the next most promising ones are expanded, so the book still
+# answers when the opponent leaves the main line.
+
+RULES = ["standard", "pro", "no_overline", "ninuki", "pente"]
+
+
+def make_cfg(size, difficulty):
+    cfg = Config()
+    cfg.board.size = size
+    cfg.game.difficulty = difficulty
+    cfg.game.noDoubleThrees = False
+    return cfg
+
+
+def valid_tiles(rules, stones, colour, tiles):
+    return [t for t in tiles if rules.validateMove(stones, Move(t, colour))[0]]
+
+
+def fallback_tile(cfg, rules, stones, colour):
+    """closest valid tile to the centre, for openings the search does not know (pente's second move)"""
+    center = cfg.board.size // 2
+    tiles = sorted(stones.allMoves, key=lambda t: (max(abs(t[0] - center), abs(t[1] - center)), t))
+    return next(t for t in tiles if t not in stones.map and rules.validateMove(stones, Move(t, colour))[0])
+
+
+def build(size, difficulty, plies, width, time_budget, max_depth):
+    cfg = make_cfg(size, difficulty)
+    rules = Rules(cfg)
+    colours = [cfg.game.player1Colour, cfg.game.player2Colour]
+    engines = {c: Minimax(cfg, rules, c, colours[1 - i]) for i, c in enumerate(colours)}
+    records = {}
+
+    def expand(stones, last_move, ply):
+        colour = colours[ply % 2]
+        key, _ = positionKey(stones, colour)
+        if key in records:
+            return
+
+        minimax = engines[colour]
+        with contextlib.redirect_stdout(io.StringIO()):
+            score, tile = minimax.search(stones, last_move, time_budget=time_budget, max_depth=max_depth)
+        if tile is None or not rules.validateMove(stones, Move(tile, colour))[0]:
+            score, tile = 0, fallback_tile(cfg, rules, stones, colour)
+        records[key] = makeRecord(stones, colour, tile, score)[1]
+
+        if ply + 1 >= plies:
+            return
+        candidates = minimax._candidates(stones, 0, colour, tile, last_move.tile if last_move else None)
+        children = [tile] + [t for t in valid_tiles(rules, stones, colour, candidates) if t != tile][:width - 1]
+        for child in children:
+            move = Move(child, colour)
+            stones.make(move, rules.previewCaptures(stones, move))
+            expand(stones, move, ply + 1)
+            stones.unmake()
+
+    expand(Stones(cfg), None, 0)
+    return records
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the opening books")
+    parser.add_argument("--rules", nargs="*", default=RULES, choices=RULES)
+    parser.add_argument("--size", nargs="*", type=int, default=[19, 15])
+    parser.add_argument("--plies", type=int, default=6, help="number of opening moves covered")
+    parser.add_argument("--width", type=int, default=3, help="moves expanded per position")
+    parser.add_argument("--time", type=float, default=0.5, help="search time per position")
+    parser.add_argument("--depth", type=int, default=10, help="max search depth per position")
+    args = parser.parse_args()
+
+    for difficulty in args.rules:
+        for size in args.size:
+            records = build(size, difficulty, args.plies, args.width, args.time, args.depth)
+            path = bookPath(difficulty, size)
+            writeBook(path, records)
+            print(f"{path}: {len(records)} positions")
+
+
+if __name__ == "__main__":
+    main()
@@ -45,6 +45,58 @@ class GameConfig:
 	humanName: str = "Human"
 	aiName: str = "AI"
 	aiType: str = "minmax"
+	aiTTSize: int = 1 << 18
+	aiTimeBudget: float = 1.0
+	aiMaxDepth: int = 10
+	# print how each AI move was found (book, solver, VCF, ponder hit, search stats)
+	aiVerbose: bool = False
+	aiMoveOrdering: bool = True
+	aiPvs: bool = True
+	aiSymmetry: bool = True
+	# late move reductions: quiet moves from the aiLmrMoves-th on, at depth >= aiLmrDepth
+	aiLmr: bool = True
+	aiLmrMoves: int = 4
+	aiLmrDepth: int = 3
+	aiLmrReduction: int = 1
+	# futility pruning of quiet moves at depth 1 when static eval + margin cannot reach alpha
+	aiFutility: bool = True
+	aiFutilityMargin: int = 500
+	# score the quiet children of depth 1 nodes in one NumPy call
+	aiBatchEval: bool = False
+	aiAspirationWindow: int = 50
+	aiWorkers: int = 1
+	aiBook: bool = True
+	aiPonder: bool = True
+	aiPonderReplies: int = 3
+	# forcing-move extension at the horizon: max plies, max nodes per leaf (0 disables)
+	aiQuiescenceDepth: int = 4
+	aiQuiescenceNodes: int = 40
+	# boards up to aiSolveMaxSize are solved by proof-number search first, once
+	# at most aiSolveMaxEmpty tiles are left (emptier boards rarely finish in budget)
+	aiSolveMaxSize: int = 9
+	aiSolveMaxEmpty: int = 12
+	aiSolveNodes: int = 3000
+	aiSolveTime: float = 0.5
+	# aiType 'mcts': iterations per move (0 = use aiTimeBudget), exploration
+	# constant, progressive widening (children ~ base * visits ** widening),
+	# playout length, leaf parallel workers and playouts per worker
+	aiMctsIterations: int = 0
+	aiMctsExploration: float = 1.4
+	aiMctsWideningBase: float = 2.0
+	aiMctsWidening: float = 0.5
+	aiMctsPlayoutDepth: int = 40
+	aiMctsWorkers: int = 1
+	aiMctsLeafPlayouts: int = 4
+	aiMctsReuse: bool = True
+	aiVcfDepth: int = 12
+	aiVcfNodes: int = 3000
+	# candidates searched per ply from the root (the last width repeats), 0 keeps all
+	aiBeamWidths: tuple[int, ...] = (20, 14, 10, 8)
+	# candidate moves are empty tiles within this distance of a stone, per board size
+	aiFrontierRadius: dict[int, int] = field(default_factory=lambda: {19: 1, 15: 1, 13: 1, 11: 1, 9: 2, 7: 2, 5: 2})
+	captureWinCount: int = 10
+	# "dict" or "bitboard": how the rules read runs, shapes and captures off the board
+	boardBackend: str = "dict"
 	noDoubleThrees: bool = field(init=False)
 
 
@@ -0,0 +1,85 @@
+from functools import lru_cache
+import numpy as np
+from core.move import Move
+from core.windows import windows, WEIGHTS, BASE
+
+
+# live window weight by packed window state (see FiveWindows), for each side
+_STATES = np.arange(BASE * BASE)
+_LIVE = (
+	np.where(_STATES // BASE == 0, _STATES % BASE, 0),
+	np.where(_STATES % BASE == 0, _STATES // BASE, 0),
+)
+_WEIGHTS = np.array(WEIGHTS, dtype=np.int64)
+
+
+@lru_cache(maxsize=None)
+def _throughArray(size) -> np.ndarray:
+	"""(size * size, 20) window indices through each tile (index y * size + x), padded with a window that is never touched"""
+	count = len(windows(size))
+	result = np.full((size * size, 20), count, dtype=np.int32)
+	filled = np.zeros(size * size, dtype=np.int32)
+	for i, window in enumerate(windows(size)):
+		for x, y in window:
+			t = y * size + x
+			result[t, filled[t]] = i
+			filled[t] += 1
+	return result
+
+
+class BatchEvaluator:
+	"""
+	Scores every quiet child of a frontier node in one go: the parent's
+	five-window states plus each candidate's change to the (at most 20)
+	windows through its tile, as one NumPy array. The scores are what
+	WinRules.evaluate gives after the move.
+
+	A move is quiet when it captures nothing and leaves no window with three
+	or more of its colour's stones through its tile, so the child is neither
+	terminal nor noisy and would be evaluated directly
+	"""
+	def __init__(self, cfg, rules):
+		self.cfg = cfg
+		self.rules = rules
+		self.through = _throughArray(cfg.board.size)
+
+
+	def scores(self, stones, tiles, colour, ai_colour) -> dict[tuple[int, int], float]:
+		"""{tile: evaluation after colour plays tile} for the quiet tiles among tiles"""
+		if not tiles or len(stones.map) + 1 >= len(stones.allMoves):
+			return {}
+		size = self.cfg.board.size
+		board = stones.windows
+		side = board.side(colour)
+		ai = board.side(ai_colour)
+		opp = 1 - ai
+
+		state = np.array(board.state + [0], dtype=np.int64)
+		index = self.through[[y * size + x for x, y in tiles]]
+		old = state[index]
+		# the padding window gets a step too, it is masked out of every count below
+		new = old + (1 if side == 0 else BASE)
+		real = index < len(board.state)
+
+		own_new = (new % BASE if side == 0 else new // BASE) * real
+		quiet = own_new.max(axis=1) < 3
+
+		def live(states, who):
+			return _LIVE[who][states] * real
+
+		ai_old, ai_new = live(old, ai), live(new, ai)
+		opp_old, opp_new = live(old, opp), live(new, opp)
+		ai_score = board.score(ai) + (_WEIGHTS[ai_new] - _WEIGHTS[ai_old]).sum(axis=1)
+		opp_score = board.score(opp) + (_WEIGHTS[opp_new] - _WEIGHTS[opp_old]).sum(axis=1)
+		opp_fours = board.count(opp, 4) + (opp_new == 4).sum(axis=1) - (opp_old == 4).sum(axis=1)
+		opp_threes = board.count(opp, 3) + (opp_new == 3).sum(axis=1) - (opp_old == 3).sum(axis=1)
+
+		values = (ai_score - opp_score * 2 + self.rules.captureScore(stones, ai_colour)).astype(float)
+		values[opp_threes >= 2] = -1e6
+		values[opp_fours > 0] = -1e9
+
+		result = {}
+		for i, tile in enumerate(tiles):
+			if quiet[i] and not self.rules.previewCaptures(stones, Move(tile, colour)):
+				result[tile] = float(values[i])
+		return result
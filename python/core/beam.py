@@ -0,0 +1,79 @@
+from core.geometry import DIRECTIONS, lineRuns
+
+# score of a run of n stones a move would make, own and opponent alike
+RUN_SCORES = {1: 0, 2: 10, 3: 100, 4: 1000, 5: 100000}
+# score of each pair a move would capture, like making a three
+CAPTURE_SCORE = RUN_SCORES[3]
+
+
+class Beam:
+	"""
+	Static beam pruning: only the best K candidates of a node are searched,
+	scored by the runs a stone on the tile would make for the side to move
+	(attack) and for the opponent (defence).
+	K comes from aiBeamWidths by distance from the root, the last width
+	repeats for deeper plies and 0 keeps every candidate.
+	Wins, blocks of the opponent's five and captures (which may win on
+	captures or break a five in ninuki and pente) are never pruned.
+	"""
+	def __init__(self, cfg):
+		self.cfg = cfg
+		widths = cfg.game.aiBeamWidths
+		self.widths = (widths,) if isinstance(widths, int) else tuple(widths)
+
+
+	def width(self, ply):
+		if not self.widths:
+			return 0
+		return self.widths[min(ply, len(self.widths) - 1)]
+
+
+	def select(self, stones, tiles, ply, colour, opponent, keep=None):
+		"""
+		tiles sorted best first and cut to the ply's width; forcing tiles and
+		keep (the transposition table move) always stay in
+		"""
+		if not self.widths:
+			return tiles
+
+		captures = self.captures(stones, colour)
+		scored = []
+		for t in tiles:
+			score, forcing = self.score(stones, t, colour, opponent, captures)
+			scored.append((-score, t, forcing))
+		scored.sort()
+
+		width = self.width(ply)
+		return [
+			t for i, (_, t, forcing) in enumerate(scored)
+			if width <= 0 or i < width or forcing or t == keep
+		]
+
+
+	def score(self, stones, tile, colour, opponent, captures=None) -> tuple[int, bool]:
+		"""
+		(static score, forcing) of placing colour on the empty tile. captures
+		is self.captures(stones, colour), passed in when scoring many tiles
+		"""
+		own = self.runs(stones, tile, colour)
+		opp = self.runs(stones, tile, opponent)
+		score = sum(RUN_SCORES[n] for n in own) * 2 + sum(RUN_SCORES[n] for n in opp)
+		if captures is None:
+			captures = self.captures(stones, colour)
+		taken = len(captures.get(tile, ()))
+		score += taken // 2 * CAPTURE_SCORE
+		return score, max(own) >= 5 or max(opp) >= 5 or taken > 0
+
+
+	def captures(self, stones, colour) -> dict:
+		"""empty tile -> the stones colour would capture there, empty without captures"""
+		if stones.threats is None:
+			return {}
+		return stones.threats.captures(colour)
+
+
+	def runs(self, stones, tile, colour):
+		"""length of colour's run through tile in each direction, capped at 5"""
+		if stones.bits is not None:
+			return [min(run, 5) for run in stones.bits.runs(tile, colour)]
+		return [min(run, 5) for run in lineRuns(stones, tile, colour)]
@@ -0,0 +1,132 @@
+from functools import lru_cache
+from core.geometry import DIRECTIONS
+from core.shapes import SPAN
+
+
+# Bitboard backend for Stones (boardBackend = "bitboard"): every colour is kept
+# as four Python ints, one per direction of DIRECTIONS. In each of them the
+# lines of that direction lie end to end, tile after tile, with GAP empty bits
+# between lines, so the five tiles either side of a tile are the 11 bits
+# around its bit and a line never runs into the next one.
+GAP = 5
+WINDOW = (1 << 11) - 1
+CENTRE = 5
+
+
+def _run(window):
+	"""length of the run of set bits through the centre bit (the centre counts as set)"""
+	run = 1
+	for step in (1, -1):
+		bit = CENTRE + step
+		while 0 <= bit <= 10 and window >> bit & 1:
+			run += 1
+			bit += step
+	return run
+
+
+def _ternary(window):
+	"""the set bits besides the centre as a base-3 digit 1 in shape index order (see core.shapes)"""
+	value = 0
+	for k, p in enumerate(SPAN):
+		if window >> (CENTRE + p) & 1:
+			value += 3 ** (len(SPAN) - 1 - k)
+	return value
+
+
+RUNS = tuple(_run(w) for w in range(WINDOW + 1))
+TERNARY = tuple(_ternary(w) for w in range(WINDOW + 1))
+
+
+@lru_cache(maxsize=None)
+def layout(size) -> tuple[tuple[dict, ...], tuple[int, ...]]:
+	"""(per direction tile -> bit, per direction mask of the bits that are tiles)"""
+	positions, boards = [], []
+	for dx, dy in DIRECTIONS:
+		position, board, bit = {}, 0, GAP
+		for x in range(size):
+			for y in range(size):
+				# a line starts where the step back leaves the board
+				if 0 <= x - dx < size and 0 <= y - dy < size:
+					continue
+				tx, ty = x, y
+				while 0 <= tx < size and 0 <= ty < size:
+					position[(tx, ty)] = bit
+					board |= 1 << bit
+					bit += 1
+					tx, ty = tx + dx, ty + dy
+				bit += GAP
+		positions.append(position)
+		boards.append(board)
+	return tuple(positions), tuple(boards)
+
+
+class BitBoard:
+	"""
+	The stones as bitboards: runs, line shapes and captures through a tile
+	are read with a shift and a mask per direction instead of a walk over
+	the tiles
+	"""
+	def __init__(self, size):
+		self.size = size
+		self.positions, self.onBoard = layout(size)
+		self.colours = {}
+		self.occupied = [0, 0, 0, 0]
+
+
+	def copy(self):
+		new = BitBoard.__new__(BitBoard)
+		new.size = self.size
+		new.positions, new.onBoard = self.positions, self.onBoard
+		new.colours = {colour: bits.copy() for colour, bits in self.colours.items()}
+		new.occupied = self.occupied.copy()
+		return new
+
+
+	def toggle(self, tile, colour):
+		"""place colour on the empty tile, or take it off again"""
+		bits = self.colours.get(colour)
+		if bits is None:
+			bits = self.colours[colour] = [0, 0, 0, 0]
+		occupied = self.occupied
+		for d, position in enumerate(self.positions):
+			mask = 1 << position[tile]
+			bits[d] ^= mask
+			occupied[d] ^= mask
+
+
+	def runs(self, tile, colour) -> list[int]:
+		"""length of colour's run through tile in each direction (up to 11), as if colour were on tile"""
+		bits = self.colours.get(colour)
+		if bits is None:
+			return [1, 1, 1, 1]
+		return [RUNS[bits[d] >> (position[tile] - CENTRE) & WINDOW] for d, position in enumerate(self.positions)]
+
+
+	def shapeIndices(self, tile, colour) -> list[int]:
+		"""core.shapes table index of colour playing tile, per direction"""
+		bits = self.colours.get(colour, (0, 0, 0, 0))
+		result = []
+		for d, position in enumerate(self.positions):
+			shift = position[tile] - CENTRE
+			own = bits[d] >> shift & WINDOW
+			blocked = ((self.occupied[d] ^ bits[d]) | ~self.onBoard[d]) >> shift & WINDOW
+			result.append(TERNARY[own] + 2 * TERNARY[blocked])
+		return result
+
+
+	def captures(self, tile, colour) -> list[tuple[int, int]]:
+		"""tiles of the opponent pairs colour playing tile would flank: X O O X"""
+		bits = self.colours.get(colour)
+		if bits is None:
+			return []
+		x, y = tile
+		result = []
+		for d, (dx, dy) in enumerate(DIRECTIONS):
+			shift = self.positions[d][tile] - CENTRE
+			own = bits[d] >> shift & WINDOW
+			opponent = (self.occupied[d] ^ bits[d]) >> shift & WINDOW
+			for step in (1, -1):
+				if own >> (CENTRE + 3 * step) & 1 and opponent >> (CENTRE + step) & 1 and opponent >> (CENTRE + 2 * step) & 1:
+					result.append((x + step * dx, y + step * dy))
+					result.append((x + 2 * step * dx, y + 2 * step * dy))
+		return result
@@ -0,0 +1,99 @@
+import mmap
+import os
+import struct
+from core.move import tileIndex, indexTile
+from core.symmetry import canonicalHash, transformTile, untransformTile
+from core.zobrist import sideKey
+
+
+# Opening book: one file per rule variant and board size, a sorted array of
+# fixed size records (canonical position key, best tile index, score).
+# Keys are canonical hashes with the side to move, tiles are stored in the
+# canonical orientation. Files are memory mapped read-only, so every process
+# (the game and the search workers) shares the same pages.
+
+RECORD = struct.Struct('<QHi')
+BOOK_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "books")
+SCORE_LIMIT = 2 ** 31 - 1
+
+_books = {}
+
+
+def bookPath(difficulty, size):
+	return os.path.join(BOOK_DIR, f"{difficulty}-{size}.book")
+
+
+def positionKey(stones, colour) -> tuple[int, int]:
+	"""(key, transform) of the position with colour to move"""
+	key, transform = canonicalHash(stones)
+	return key ^ sideKey(colour), transform
+
+
+def makeRecord(stones, colour, tile, score) -> tuple[int, tuple[int, int]]:
+	"""key and (canonical tile index, score) for writeBook: colour plays tile here"""
+	key, transform = positionKey(stones, colour)
+	size = stones.cfg.board.size
+	return key, (tileIndex(transformTile(tile, transform, size), size), int(max(-SCORE_LIMIT, min(SCORE_LIMIT, score))))
+
+
+def writeBook(path, records):
+	"""records: {key: (canonical tile index, score)}, written sorted by key"""
+	os.makedirs(os.path.dirname(path), exist_ok=True)
+	with open(path, "wb") as f:
+		for key in sorted(records):
+			index, score = records[key]
+			f.write(RECORD.pack(key, index, score))
+
+
+class OpeningBook:
+	def __init__(self, path):
+		self.path = path
+		self.data = None
+		self.count = 0
+		if os.path.exists(path) and os.path.getsize(path) >= RECORD.size:
+			with open(path, "rb") as f:
+				self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+			self.count = len(self.data) // RECORD.size
+
+
+	@classmethod
+	def open(cls, cfg):
+		"""The shared book for the configured rules and board size (possibly empty)"""
+		path = bookPath(cfg.game.difficulty, cfg.board.size)
+		if path not in _books:
+			_books[path] = cls(path)
+		return _books[path]
+
+
+	def find(self, key) -> tuple[int, int] | None:
+		"""binary search for key, returns (tile index, score)"""
+		lo, hi = 0, self.count
+		while lo < hi:
+			mid = (lo + hi) // 2
+			found, index, score = RECORD.unpack_from(self.data, mid * RECORD.size)
+			if found == key:
+				return index, score
+			if found < key:
+				lo = mid + 1
+			else:
+				hi = mid
+		return None
+
+
+	def lookup(self, stones, colour) -> tuple[int, tuple[int, int]] | None:
+		"""(score, tile) for colour to move in this position, in the actual orientation"""
+		if self.count == 0:
+			return None
+		key, transform = positionKey(stones, colour)
+		found = self.find(key)
+		if found is None:
+			return None
+
+		index, score = found
+		size = stones.cfg.board.size
+		tile = untransformTile(indexTile(index, size), transform, size)
+		return (score, tile)
+
+
+	def __len__(self):
+		return self.count
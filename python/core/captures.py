@@ -0,0 +1,61 @@
+from functools import lru_cache
+from core.geometry import allTiles, rays
+
+
+@lru_cache(maxsize=None)
+def captureLines(size) -> dict[tuple[int, int], tuple[tuple, ...]]:
+	"""
+	tile -> every capture line (key, empty, first, second, flank) it is part
+	of: four tiles in a row from the tile a capturing stone would land on
+	"""
+	result = {tile: [] for tile in allTiles(size)}
+	for tile in allTiles(size):
+		for r, ray in enumerate(rays(size)[tile]):
+			if len(ray) < 3:
+				continue
+			line = ((tile, r), tile, ray[0], ray[1], ray[2])
+			for t in line[1:]:
+				result[t].append(line)
+	return {tile: tuple(lines) for tile, lines in result.items()}
+
+
+class CaptureIndex:
+	"""
+	Ninuki-renju and Pente: every pair that can be captured right now, kept
+	up to date as stones come and go. A pair is capturable when one end is
+	flanked by an opponent stone and the other end is empty; the threat is
+	keyed by the capture line and holds (capturing colour, empty tile, pair).
+	A stone changing only affects the lines through its tile
+	"""
+	def __init__(self, size):
+		self.lines = captureLines(size)
+		self.threats = {}
+
+
+	def copy(self):
+		new = CaptureIndex.__new__(CaptureIndex)
+		new.lines = self.lines
+		new.threats = self.threats.copy()
+		return new
+
+
+	def update(self, occupied, tile):
+		"""re-read the capture lines through tile after it changed"""
+		threats = self.threats
+		for key, empty, first, second, flank in self.lines[tile]:
+			colour = occupied.get(first)
+			capturer = occupied.get(flank)
+			if (colour is not None and capturer is not None and capturer != colour
+					and empty not in occupied and occupied.get(second) == colour):
+				threats[key] = (capturer, empty, first, second)
+			else:
+				threats.pop(key, None)
+
+
+	def captures(self, colour) -> dict[tuple[int, int], list[tuple[int, int]]]:
+		"""empty tile -> the stones colour would capture by playing it"""
+		result = {}
+		for capturer, empty, first, second in self.threats.values():
+			if capturer == colour:
+				result.setdefault(empty, []).extend((first, second))
+		return result
@@ -1,5 +1,7 @@
 import pygame
+import random
 import time
+from concurrent.futures import ThreadPoolExecutor
 from ui.screen import Screen
 from ui.menu import Menu
 from ui.stones import Stones
@@ -32,6 +34,10 @@ def __init__(self):
             self.cfg.game.player2Colour,
             self.cfg.game.player2Name
         )
+        # AI searches run on this thread so the game loop keeps drawing and handling keys
+        self.ai_executor = ThreadPoolExecutor(max_workers=1)
+        self.ai_future = None
+        self.ai_thinking_player = None
         self._reset()
         self.running = True
         self.exit_type = None
@@ -41,6 +47,8 @@ def __init__(self):
 
 
     def _reset(self):
+        self._cancel_ai()
+        self._stop_pondering()
         self.stones = Stones(self.cfg)
         self.current_player = self.player1
         self.game_over = False
@@ -54,6 +62,67 @@ def _reset(self):
         self.ai_thinking_time = None
         self.ai_move_start_time = None
 
+    def _cancel_ai(self):
+        """Stop a running AI search and throw its move away"""
+        if self.ai_future is None:
+            return
+        self.ai_thinking_player.cancelSearch()
+        try:
+            self.ai_future.result()
+        except Exception as e:
+            print(f"AI error while cancelling: {e}")
+        finally:
+            self.ai_future = None
+            self.ai_thinking_player = None
+            self.ai_move_start_time = None
+
+    def _poll_ai(self):
+        """Start the AI search on the worker thread, or collect its move once it is done"""
+        if self.ai_future is None:
+            self.ai_move_start_time = time.time()
+            self.ai_thinking_player = self.current_player
+            self.ai_future = self.ai_executor.submit(
+                self._timed_action, self.current_player, self.stones.copy(), self.last_move
+            )
+            return None
+
+        if not self.ai_future.done():
+            return None
+
+        try:
+            move, elapsed = self.ai_future.result()
+        except Exception as e:
+            # same fallback as AI.doAction, so the AI always gets its next turn
+            print(f"AI error: {e}. Making random move...")
+            move, elapsed = self._random_move(self.ai_thinking_player), time.time() - self.ai_move_start_time
+        finally:
+            self.ai_future = None
+            self.ai_thinking_player = None
+            self.ai_move_start_time = None
+        self.ai_thinking_time = elapsed
+        return move
+
+    def _random_move(self, player):
+        empty_tiles = [(x, y) for x in range(self.cfg.board.size)
+                       for y in range(self.cfg.board.size)
+                       if (x, y) not in self.stones.map]
+        if empty_tiles:
+            return Move(random.choice(empty_tiles), player.colour)
+        return None
+
+    @staticmethod
+    def _timed_action(player, stones, last_move):
+        """Runs on the AI thread: the move and the wall-clock time spent searching for it"""
+        start = time.perf_counter()
+        move = player.doAction(stones, None, last_move)
+        return move, time.perf_counter() - start
+
+    def _stop_pondering(self):
+        from player.player import AI
+        for player in (self.player1, self.player2):
+            if isinstance(player, AI):
+                player.stopPondering()
+
     def _is_board_full(self):
         """Check if the board is completely full"""
         total_tiles = self.cfg.board.size * self.cfg.board.size
@@ -87,6 +156,9 @@ def run(self):
                 print(f"Unexpected error in game loop: {e}")
                 continue
 
+        self._cancel_ai()
+        self._stop_pondering()
+        self.ai_executor.shutdown()
         return self.exit_type
 
 
@@ -109,6 +181,10 @@ def show_menu():
                     show_menu()
                 elif event.key == pygame.K_s:
                     self.show_suggestions = not self.show_suggestions
+                elif event.key == pygame.K_c:
+                    # play the best move found so far
+                    if self.ai_future is not None:
+                        self.ai_thinking_player.cancelSearch()
                 elif self.game_over:
                     if event.key == pygame.K_r:
                         self._reset()
@@ -128,18 +204,14 @@ def _handle_actions(self, events):
         from player.player import AI
         is_ai_player = isinstance(self.current_player, AI)
 
-        if is_ai_player and (current_time - self.last_move_time) < self.ai_move_delay:
+        if is_ai_player and self.ai_future is None and (current_time - self.last_move_time) < self.ai_move_delay:
             return
 
         try:
             if is_ai_player:
-                self.ai_move_start_time = current_time
-
-            move = self.current_player.doAction(self.stones, events, self.last_move)
-
-            if is_ai_player and move and self.ai_move_start_time:
-                self.ai_thinking_time = current_time - self.ai_move_start_time
-                self.ai_move_start_time = None
+                move = self._poll_ai()
+            else:
+                move = self.current_player.doAction(self.stones, events, self.last_move)
 
             if move:
                 is_valid, error_message = self.rules.validateMove(self.stones, move)
@@ -155,6 +227,7 @@ def _handle_actions(self, events):
                     captures = self.rules.getCaptures(self.stones, move)
                     if captures:
                         self.stones.remove(captures)
+                        self.stones.addCaptures(move.colour, len(captures))
                         self.current_player.captures += len(captures)
 
                         self._render()
@@ -179,7 +252,7 @@ def _handle_actions(self, events):
                                 self.winning_tiles = None
                         else:
                             self.game_over = True
-                    elif self.current_player.captures >= 10:
+                    elif self.current_player.captures >= self.cfg.game.captureWinCount:
                         self.game_over = True
                         self.winning_tiles = None
                     elif self._is_board_full():
@@ -190,9 +263,12 @@ def _handle_actions(self, events):
                         pygame.time.wait(2000)
                         self._reset()
                     else:
+                        mover = self.current_player
                         self.current_player = (
                             self.player1 if self.current_player == self.player2 else self.player2
                         )
+                        if is_ai_player and not isinstance(self.current_player, AI):
+                            mover.startPondering(self.stones)
                 else:
                     self.invalid_move_message = error_message
                     self.invalid_move_time = current_time
@@ -223,11 +299,13 @@ def _render(self):
             line1 = f"{self.cfg.game.difficulty} rules ({self.cfg.board.size}x{self.cfg.board.size}) | {self.player1.name}{p1_type} vs {self.player2.name}{p2_type}"
 
             ai_timer_display = ""
-            if self.ai_thinking_time is not None:
+            if self.ai_future is not None and self.ai_move_start_time is not None:
+                ai_timer_display = f" | AI thinking: {time.time() - self.ai_move_start_time:.1f}s C=move now"
+            elif self.ai_thinking_time is not None:
                 ai_timer_display = f" | AI time: {self.ai_thinking_time:.2f}s"
 
             if self.game_over:
-                if self.current_player.captures >= 10:
+                if self.current_player.captures >= self.cfg.game.captureWinCount:
                     status = f"{self.current_player.name}{current_type} wins by capture!"
                 else:
                     status = f"{self.current_player.name}{current_type} wins!"
@@ -0,0 +1,88 @@
+from functools import lru_cache
+
+
+# Board geometry, built once per board size and shared by the rules and the
+# search so their inner loops need no bounds checks: tiles, neighbourhoods,
+# rays and line segments through every tile.
+
+# the four lines through a tile
+DIRECTIONS = [(0, 1), (1, 0), (1, 1), (1, -1)]
+# the eight rays out of a tile: the four line directions, then the same reversed
+RAY_DIRECTIONS = DIRECTIONS + [(-dx, -dy) for dx, dy in DIRECTIONS]
+
+
+@lru_cache(maxsize=None)
+def allTiles(size) -> tuple[tuple[int, int], ...]:
+	return tuple((x, y) for x in range(size) for y in range(size))
+
+
+@lru_cache(maxsize=None)
+def neighbours(size, radius) -> dict[tuple[int, int], tuple[tuple[int, int], ...]]:
+	"""tile -> on-board tiles within radius (king steps) of it, excluding itself"""
+	result = {}
+	for x, y in allTiles(size):
+		result[(x, y)] = tuple(
+			(x + dx, y + dy)
+			for dx in range(-radius, radius + 1)
+			for dy in range(-radius, radius + 1)
+			if (dx or dy) and 0 <= x + dx < size and 0 <= y + dy < size
+		)
+	return result
+
+
+@lru_cache(maxsize=None)
+def rays(size) -> dict[tuple[int, int], tuple[tuple[tuple[int, int], ...], ...]]:
+	"""tile -> for each of RAY_DIRECTIONS, the on-board tiles stepping away from it, nearest first"""
+	result = {}
+	for x, y in allTiles(size):
+		tile_rays = []
+		for dx, dy in RAY_DIRECTIONS:
+			ray = []
+			nx, ny = x + dx, y + dy
+			while 0 <= nx < size and 0 <= ny < size:
+				ray.append((nx, ny))
+				nx += dx
+				ny += dy
+			tile_rays.append(tuple(ray))
+		result[(x, y)] = tuple(tile_rays)
+	return result
+
+
+@lru_cache(maxsize=None)
+def lines(size, reach) -> dict[tuple[int, int], tuple[tuple, ...]]:
+	"""tile -> for each direction, the tiles from -reach to reach steps along it (None when off the board)"""
+	def cell(x, y):
+		return (x, y) if 0 <= x < size and 0 <= y < size else None
+
+	return {
+		(x, y): tuple(tuple(cell(x + i * dx, y + i * dy) for i in range(-reach, reach + 1)) for dx, dy in DIRECTIONS)
+		for x, y in allTiles(size)
+	}
+
+
+@lru_cache(maxsize=None)
+def segments(size, reach) -> dict[tuple[int, int], tuple[tuple[tuple[int, tuple[int, int]], ...], ...]]:
+	"""tile -> for each direction, (offset, tile) of the on-board tiles within reach steps, the tile itself left out"""
+	return {
+		tile: tuple(
+			tuple((i - reach, t) for i, t in enumerate(line) if t is not None and i != reach)
+			for line in directions
+		)
+		for tile, directions in lines(size, reach).items()
+	}
+
+
+def lineRuns(stones, tile, colour) -> list[int]:
+	"""length of colour's run through tile in each direction, counting tile as colour's"""
+	occupied = stones.map
+	tile_rays = rays(stones.cfg.board.size)[tile]
+	result = []
+	for d in range(4):
+		count = 1
+		for ray in (tile_rays[d], tile_rays[d + 4]):
+			for t in ray:
+				if occupied.get(t) != colour:
+					break
+				count += 1
+		result.append(count)
+	return result
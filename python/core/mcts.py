@@ -0,0 +1,281 @@
+import math
+import multiprocessing
+import random
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from core.move import Move, colourCode, codeColour
+from core.beam import Beam
+from core.geometry import lines
+from core.parallel import encodeBoard, decodeBoard, _makeConfig
+
+
+# Leaf parallelism: extra playouts from the same leaf on a process pool
+_pools = {}
+_worker_engines = {}
+
+
+class _Node:
+	__slots__ = ("tile", "colour", "parent", "children", "untried", "visits", "wins", "key")
+
+	def __init__(self, tile, colour, parent, key):
+		self.tile = tile
+		self.colour = colour
+		self.parent = parent
+		self.children = []
+		self.untried = None
+		self.visits = 0
+		self.wins = 0.0
+		self.key = key
+
+
+class MCTS:
+	"""
+	Monte Carlo tree search (UCT) for the AI player.
+	Progressive widening: a node with n visits may have about
+	aiMctsWideningBase * n ** aiMctsWidening children, taken from the
+	candidate tiles best first, so the tree grows wide only where it is visited.
+	Playouts play an immediate win or block the opponent's five when there is
+	one, else a random tile next to the stones.
+	The tree is kept between moves and re-rooted at the position after the
+	opponent's reply.
+	"""
+	def __init__(self, cfg, rules, ai_colour, opponent_colour):
+		self.cfg = cfg
+		self.rules = rules
+		self.ai_colour = ai_colour
+		self.opponent_colour = opponent_colour
+		self.beam = Beam(cfg)
+		self.random = random.Random(0)
+		self.cancel = threading.Event()
+		self.root = None
+		self.iterations = 0
+		self.playouts = 0
+
+
+	def search(self, stones, last_move, time_budget=None, iterations=None) -> tuple[float, tuple[int, int]]:
+		"""(win rate, tile) of the most visited move after the iteration or time budget"""
+		if time_budget is None:
+			time_budget = self.cfg.game.aiTimeBudget
+		if iterations is None:
+			iterations = self.cfg.game.aiMctsIterations
+		deadline = time.perf_counter() + time_budget
+		board = stones.copy()
+
+		self.root = self._reuse(board)
+		self.iterations = 0
+		self.playouts = 0
+		while not self.cancel.is_set():
+			if iterations > 0 and self.iterations >= iterations:
+				break
+			if iterations <= 0 and time.perf_counter() >= deadline:
+				break
+			self._iterate(board, last_move)
+			self.iterations += 1
+
+		if not self.root.children:
+			tiles = self._candidates(board, self.ai_colour)
+			return (0.0, tiles[0] if tiles else None)
+		best = max(self.root.children, key=lambda c: c.visits)
+		return (best.wins / best.visits, best.tile)
+
+
+	def report(self) -> str:
+		visits = self.root.visits if self.root is not None else 0
+		return f"mcts iterations {self.iterations} playouts {self.playouts} root visits {visits}"
+
+
+	def _reuse(self, board):
+		"""the subtree for this position if the last search saw it coming, else a new root"""
+		if self.cfg.game.aiMctsReuse and self.root is not None:
+			for child in self.root.children:
+				for grandchild in child.children:
+					if grandchild.key == board.hash:
+						grandchild.parent = None
+						return grandchild
+		return _Node(None, self.opponent_colour, None, board.hash)
+
+
+	def _iterate(self, board, last_move):
+		"""selection, expansion, playout and backpropagation, leaving board unchanged"""
+		node = self.root
+		made = 0
+		winner = None
+		move = last_move
+
+		# select down the tree, widening as visits grow
+		while winner is None:
+			colour = self._other(node.colour)
+			if node.untried is None:
+				node.untried = self._candidates(board, colour)
+			allowed = max(1, int(self.cfg.game.aiMctsWideningBase * (node.visits + 1) ** self.cfg.game.aiMctsWidening))
+			if node.untried and len(node.children) < allowed:
+				tile = node.untried.pop(0)
+				move = Move(tile, colour)
+				self._make(board, move)
+				made += 1
+				child = _Node(tile, colour, node, board.hash)
+				node.children.append(child)
+				node = child
+				winner = self._winner(board, move)
+				break
+			if not node.children:
+				break
+			node = self._select(node)
+			move = Move(node.tile, node.colour)
+			self._make(board, move)
+			made += 1
+			winner = self._winner(board, move)
+
+		if winner is None and not board.isFull():
+			results = self._playouts(board, node, move)
+		else:
+			results = {winner: 1} if winner is not None else {None: 1}
+
+		for _ in range(made):
+			board.unmake()
+
+		total = sum(results.values())
+		while node is not None:
+			node.visits += total
+			node.wins += results.get(node.colour, 0) + results.get(None, 0) * 0.5
+			node = node.parent
+
+
+	def _select(self, node):
+		"""UCT: best win rate plus an exploration bonus for rarely visited children"""
+		c = self.cfg.game.aiMctsExploration
+		log_n = math.log(max(node.visits, 1))
+		return max(node.children, key=lambda ch: ch.wins / ch.visits + c * math.sqrt(log_n / ch.visits) if ch.visits else float('inf'))
+
+
+	def _candidates(self, board, colour):
+		"""tiles next to the stones, best static score first"""
+		tiles = sorted(board.frontier) if board.frontier else [(self.cfg.board.size // 2,) * 2]
+		scored = sorted(tiles, key=lambda t: -self.beam.score(board, t, colour, self._other(colour))[0])
+		return [t for t in scored if self.rules.validateMove(board, Move(t, colour))[0]]
+
+
+	def _playouts(self, board, node, last_move):
+		"""{winner colour or None for a draw: count} of the playouts from node"""
+		colour = self._other(node.colour)
+		workers = self.cfg.game.aiMctsWorkers
+		if workers <= 1:
+			winner = _playout(self.cfg, self.rules, board, colour, last_move, self.random)
+			self.playouts += 1
+			return {winner: 1}
+
+		params, encoded, captures, last = encodeBoard(self.cfg, board, last_move)
+		count = self.cfg.game.aiMctsLeafPlayouts
+		futures = [
+			_pool(workers).submit(_workerPlayouts, params, encoded, captures, last,
+				colourCode(self.cfg, colour), count, self.random.getrandbits(32))
+			for _ in range(workers)
+		]
+		results = {}
+		for future in futures:
+			for code, n in future.result().items():
+				winner = codeColour(self.cfg, code)
+				results[winner] = results.get(winner, 0) + n
+		self.playouts += count * workers
+		return results
+
+
+	def _make(self, board, move):
+		board.make(move, self.rules.previewCaptures(board, move))
+
+
+	def _winner(self, board, move):
+		if self.rules.checkWin(board, move) or self.rules.checkCaptureWin(board, move):
+			return move.colour
+		return None
+
+
+	def _other(self, colour):
+		return self.opponent_colour if colour == self.ai_colour else self.ai_colour
+
+
+def _playout(cfg, rules, board, colour, last_move, rng):
+	"""
+	Play the position out and return the winner (None for a draw or when
+	aiMctsPlayoutDepth moves pass). board is restored afterwards
+	"""
+	colours = {cfg.game.player1Colour: cfg.game.player2Colour, cfg.game.player2Colour: cfg.game.player1Colour}
+	made = 0
+	winner = None
+	previous = None
+	try:
+		for _ in range(cfg.game.aiMctsPlayoutDepth):
+			if board.isFull():
+				break
+			tile = _playoutTile(cfg, rules, board, colour, colours[colour], last_move, previous, rng)
+			if tile is None:
+				break
+			move = Move(tile, colour)
+			board.make(move, rules.previewCaptures(board, move))
+			made += 1
+			if rules.checkWin(board, move) or rules.checkCaptureWin(board, move):
+				winner = colour
+				break
+			previous, last_move = last_move, move
+			colour = colours[colour]
+	finally:
+		for _ in range(made):
+			board.unmake()
+	return winner
+
+
+def _playoutTile(cfg, rules, board, colour, opponent, last_move, own_move, rng):
+	"""complete five, else block the opponent's five, else a random legal tile near the stones"""
+	for move, who in ((own_move, colour), (last_move, opponent)):
+		if move is None:
+			continue
+		tile = _fiveTile(cfg, rules, board, move.tile, who)
+		if tile is not None and rules.validateMove(board, Move(tile, colour))[0]:
+			return tile
+
+	tiles = list(board.frontier) if board.frontier else [(cfg.board.size // 2,) * 2]
+	for _ in range(8):
+		tile = rng.choice(tiles)
+		if rules.validateMove(board, Move(tile, colour))[0]:
+			return tile
+	return None
+
+
+def _fiveTile(cfg, rules, board, tile, colour):
+	"""an empty tile on the lines through tile that completes five for colour"""
+	occupied = board.map
+	for line in lines(cfg.board.size, 4)[tile]:
+		# a five through tile needs four of colour's stones within four steps of it
+		if sum(occupied.get(t) == colour for t in line) < 4:
+			continue
+		for t in line:
+			if t is not None and t not in occupied and rules.checkWin(board, Move(t, colour)):
+				return t
+	return None
+
+
+def _pool(workers):
+	if workers not in _pools:
+		_pools[workers] = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+	return _pools[workers]
+
+
+def _workerPlayouts(params, encoded, captures, last, colour_code, count, seed):
+	"""Worker entry point: count playouts from the decoded board, {colour code (0 = draw): wins}"""
+	from core.rules import Rules
+
+	if params not in _worker_engines:
+		cfg = _makeConfig(params)
+		_worker_engines[params] = (cfg, Rules(cfg))
+	cfg, rules = _worker_engines[params]
+
+	board, last_move = decodeBoard(cfg, encoded, captures, last)
+	colour = codeColour(cfg, colour_code)
+	rng = random.Random(seed)
+	results = {}
+	for _ in range(count):
+		winner = _playout(cfg, rules, board, colour, last_move, rng)
+		code = colourCode(cfg, winner)
+		results[code] = results.get(code, 0) + 1
+	return results
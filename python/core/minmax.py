@@ -1,8 +1,27 @@
+import time
+import threading
 from config import Config
 from ui.stones import Stones
 from core.rules import Rules
 from core.move import Move
 from core.utils import *
+from core.zobrist import sideKey
+from core.symmetry import canonicalHash, selfSymmetries, transformTile, untransformTile
+from core.transposition import TranspositionTable, EXACT, LOWER, UPPER
+from core.move_ordering import MoveOrdering
+from core.beam import Beam
+from core.geometry import rays, segments
+from core.batch import BatchEvaluator
+from core.parallel import ParallelRoot
+
+
+# evaluations this large are threats of a win or loss (see WinRules.evaluate)
+MATE_SCORE = 1e6
+
+
+class SearchTimeout(Exception):
+	"""Raised inside the recursion once the per-move deadline has passed"""
+	pass
 
 
 class Minimax:
@@ -11,14 +30,114 @@ def __init__(self, cfg, rules, ai_colour, opponent_colour):
 		self.rules = rules
 		self.ai_colour = ai_colour
 		self.opponent_colour = opponent_colour
+		self.tt = TranspositionTable(cfg.game.aiTTSize)
+		self.ordering = MoveOrdering(cfg.game.aiMoveOrdering)
+		self.beam = Beam(cfg)
+		self.batch = BatchEvaluator(cfg, rules) if cfg.game.aiBatchEval else None
+		self.parallel = ParallelRoot(cfg.game.aiWorkers) if cfg.game.aiWorkers > 1 else None
+		self.deadline = None
+		self.cancel = threading.Event()
+		self.nodes = 0
+		self.qnodes = 0
+		self.completed_depth = 0
+
+
+	def search(self, stones, last_move, time_budget=None, max_depth=None) -> tuple[int, tuple[int, int]]:
+		"""
+		iterative deepening: search depth 1, 2, 3... until the time budget runs out
+		and return the result of the last completed iteration.
+		depth 1 always completes so there is a move to play even on a tiny budget,
+		unless the search is cancelled from another thread through self.cancel
+		"""
+		if time_budget is None:
+			time_budget = self.cfg.game.aiTimeBudget
+		if max_depth is None:
+			max_depth = self.cfg.game.aiMaxDepth
+
+		self.tt.newSearch()
+		self.ordering.newSearch()
+		self.nodes = 0
+		self.completed_depth = 0
+		deadline = time.perf_counter() + time_budget
+		best = (0, None)
+
+		# the whole search runs make/unmake on this one board
+		board = stones.copy()
+
+		for depth in range(1, max_depth + 1):
+			self.deadline = deadline if depth > 1 else None
+			try:
+				if self.parallel is not None and depth > 1:
+					best = self._parallelRoot(board, last_move, depth, deadline)
+				else:
+					best = self._aspiration(board, last_move, depth, best[0])
+			except SearchTimeout:
+				break
+			finally:
+				self.deadline = None
+			self.completed_depth = depth
+
+			# a forced win or loss will not change with more depth
+			if abs(best[0]) == float('inf'):
+				break
+			if time.perf_counter() >= deadline:
+				break
+
+		# cancelled before depth 1 finished: fall back to the first candidate
+		if best[1] is None and not self._is_terminal(board, last_move):
+			best = (0, self._getPossibleTiles(board)[0])
+		return best
 
 
-	def choose_move(self, stones, last_move, depth, current_colour=None, alpha=-float('inf'), beta=float('inf')) -> tuple[int, tuple[int, int]]:
+	def _aspiration(self, stones, last_move, depth, previous_score):
+		"""
+		search the root with a narrow window around the previous iteration's score,
+		falling back to the full window if the result lands outside it
+		"""
+		window = self.cfg.game.aiAspirationWindow
+		if window > 0 and depth > 2 and abs(previous_score) != float('inf'):
+			alpha, beta = previous_score - window, previous_score + window
+			result = self.choose_move(stones, last_move, depth, alpha=alpha, beta=beta)
+			if alpha < result[0] < beta:
+				return result
+		return self.choose_move(stones, last_move, depth)
+
+
+	def _parallelRoot(self, stones, last_move, depth, deadline):
+		"""search the root moves on the process pool, same result as choose_move at the root"""
+		key, transform = self._ttKey(stones, self.ai_colour)
+		hash_tile = self._ttTile(self.tt.probe(key), transform)
+		last_tile = last_move.tile if last_move else None
+		tiles = self._candidates(stones, 0, self.ai_colour, hash_tile, last_tile)
+
+		wall_deadline = time.time() + (deadline - time.perf_counter())
+		score, tile, (nodes, cutoffs, first_cutoffs) = self.parallel.search(
+			self.cfg, stones, last_move, self.ai_colour, tiles, depth, wall_deadline, self.cancel)
+		self.nodes += nodes
+		self.ordering.cutoffs += cutoffs
+		self.ordering.first_cutoffs += first_cutoffs
+		if tile is None:
+			raise SearchTimeout()
+
+		self._ttStore(key, transform, depth, EXACT, score, tile)
+		return (score, tile)
+
+
+	def report(self) -> str:
+		"""One line summary of the last search, e.g. to compare move ordering settings"""
+		depth = max(self.completed_depth, 1)
+		return (f"depth {self.completed_depth} nodes {self.nodes} "
+			f"ebf {self.nodes ** (1 / depth):.2f} "
+			f"cutoffs {self.ordering.cutoffs} first-move {self.ordering.firstCutoffRate():.0%}")
+
+
+	def choose_move(self, stones, last_move, depth, current_colour=None, alpha=-float('inf'), beta=float('inf'), ply=0) -> tuple[int, tuple[int, int]]:
 		"""
 		minimax algorithm: ai wants to maximize its score, opponent wants to minimize ai's score
 		alpha-beta pruning: 
 			- alpha: best score for ai so far
 			- beta: best score for opponent so far
+		ply is the distance from the root, used to index killer moves
 		"""
 		if current_colour is None:
 			# If first call, decide whose turn it is based on last_move
@@ -27,74 +146,357 @@ def choose_move(self, stones, last_move, depth, current_colour=None, alpha=-floa
 			else:
 				current_colour = self.opponent_colour if last_move.colour == self.ai_colour else self.ai_colour
 
-		if self._is_terminal(stones, last_move) or depth == 0:
+		self.nodes += 1
+		if (self.deadline is not None and time.perf_counter() > self.deadline) or self.cancel.is_set():
+			raise SearchTimeout()
+
+		if self._is_terminal(stones, last_move):
 			score = self.rules.evaluate(stones, self.ai_colour, last_move)
 			return (score, last_move.tile if last_move else None)
+		if depth == 0:
+			if not self._isNoisy(stones, last_move):
+				return (self.rules.evaluate(stones, self.ai_colour, last_move), last_move.tile if last_move else None)
+			self.qnodes = 0
+			score = self._quiesce(stones, last_move, current_colour, alpha, beta, self.cfg.game.aiQuiescenceDepth)
+			return (score, last_move.tile if last_move else None)
+
+		key, transform = self._ttKey(stones, current_colour)
+		entry = self.tt.probe(key)
+		hash_tile = self._ttTile(entry, transform)
+		if entry is not None and entry.depth >= depth and hash_tile is not None:
+			if entry.flag == EXACT:
+				return (entry.score, hash_tile)
+			elif entry.flag == LOWER:
+				alpha = max(alpha, entry.score)
+			elif entry.flag == UPPER:
+				beta = min(beta, entry.score)
+			if beta <= alpha:
+				return (entry.score, hash_tile)
+		alpha_orig, beta_orig = alpha, beta
 
 		is_ai_turn = (current_colour == self.ai_colour)
 		best_score = -float('inf') if is_ai_turn else float('inf')
 		best_tile = None
+		last_tile = last_move.tile if last_move else None
 
-		for t in self._getPossibleTiles(stones):
-			move = Move(t, current_colour)
-			new_stones = stones.copy()
-			new_stones.place(move)
+		next_colour = self.opponent_colour if current_colour == self.ai_colour else self.ai_colour
+		tiles = self._candidates(stones, ply, current_colour, hash_tile, last_tile)
+		futility = self._futilityBound(stones, last_move, depth, alpha, beta, is_ai_turn)
+		# quiet children of a frontier node are leaves that would only be evaluated
+		leaves = self.batch.scores(stones, tiles, current_colour, self.ai_colour) if depth == 1 and self.batch else {}
+		for i, t in enumerate(tiles):
+			quiet = t != hash_tile and self._isQuiet(stones, t, current_colour, next_colour)
+			# frontier node too far from the window: a quiet move will not get there
+			if futility is not None and quiet and i > 0:
+				if is_ai_turn:
+					best_score = max(best_score, futility)
+				else:
+					best_score = min(best_score, futility)
+				continue
 
-			score, _ = self.choose_move(
-				new_stones, move, depth - 1,
-				self.opponent_colour if current_colour == self.ai_colour else self.ai_colour,
-				alpha, beta
-			)
+			if t in leaves:
+				self.nodes += 1
+				score = leaves[t]
+			else:
+				move = Move(t, current_colour)
+				stones.make(move, self.rules.previewCaptures(stones, move))
+				try:
+					if quiet and self._reduce(depth, i):
+						score = self._lmr(stones, move, depth, next_colour, alpha, beta, ply, is_ai_turn)
+					else:
+						score = self._pvs(stones, move, depth - 1, next_colour, alpha, beta, ply + 1, i == 0, is_ai_turn)
+				finally:
+					stones.unmake()
 
 			# If a winning move is found, return it immediately
 			if (is_ai_turn and score == float('inf')) or (not is_ai_turn and score == -float('inf')):
+				self.ordering.recordCutoff(t, ply, current_colour, depth, last_tile, i)
+				self._ttStore(key, transform, depth, EXACT, score, t)
 				return (score, t)
 
 			if is_ai_turn:
 				if score > best_score:
 					best_score, best_tile = score, t
 				alpha = max(alpha, best_score)
-				if beta <= alpha:
-					break
 			else:
 				if score < best_score:
 					best_score, best_tile = score, t
 				beta = min(beta, best_score)
-				if beta <= alpha:
-					break
+			if beta <= alpha:
+				self.ordering.recordCutoff(t, ply, current_colour, depth, last_tile, i)
+				break
+
+		if best_score <= alpha_orig:
+			flag = UPPER
+		elif best_score >= beta_orig:
+			flag = LOWER
+		else:
+			flag = EXACT
+		self._ttStore(key, transform, depth, flag, best_score, best_tile)
 
 		return (best_score, best_tile)
 
 
+	def _reduce(self, depth, index):
+		"""late move reductions apply to quiet moves after the first aiLmrMoves, away from the horizon"""
+		game = self.cfg.game
+		return game.aiLmr and index >= game.aiLmrMoves and depth >= game.aiLmrDepth
+
+
+	def _lmr(self, stones, move, depth, colour, alpha, beta, ply, is_ai_turn):
+		"""
+		search a late quiet move aiLmrReduction plies shallower, and again at full
+		depth only if it looks better than the best move so far
+		"""
+		reduced = max(depth - 1 - self.cfg.game.aiLmrReduction, 0)
+		if is_ai_turn:
+			low, high = (alpha, alpha + 1) if abs(alpha) != float('inf') else (alpha, beta)
+			score = self.choose_move(stones, move, reduced, colour, low, high, ply + 1)[0]
+			if score <= alpha:
+				return score
+		else:
+			low, high = (beta - 1, beta) if abs(beta) != float('inf') else (alpha, beta)
+			score = self.choose_move(stones, move, reduced, colour, low, high, ply + 1)[0]
+			if score >= beta:
+				return score
+		return self._pvs(stones, move, depth - 1, colour, alpha, beta, ply + 1, False, is_ai_turn)
+
+
+	def _futilityBound(self, stones, last_move, depth, alpha, beta, is_ai_turn):
+		"""
+		at depth 1, the static eval plus aiFutilityMargin for the side to move,
+		if even that cannot reach the window (quiet moves are then skipped), else None
+		"""
+		game = self.cfg.game
+		if not game.aiFutility or depth != 1 or abs(alpha) == float('inf') or abs(beta) == float('inf'):
+			return None
+		static = self.rules.evaluate(stones, self.ai_colour, last_move)
+		# near a win or a loss the evaluation is not a margin away from anything
+		if abs(static) >= MATE_SCORE:
+			return None
+		if is_ai_turn and static + game.aiFutilityMargin <= alpha:
+			return static + game.aiFutilityMargin
+		if not is_ai_turn and static - game.aiFutilityMargin >= beta:
+			return static - game.aiFutilityMargin
+		return None
+
+
+	def _isQuiet(self, stones, tile, colour, opponent):
+		"""no three or longer for either side through tile, so no threat is made or answered"""
+		return max(self.beam.runs(stones, tile, colour)) < 3 and max(self.beam.runs(stones, tile, opponent)) < 3
+
+
+	def _pvs(self, stones, move, depth, colour, alpha, beta, ply, first, is_ai_turn):
+		"""
+		principal variation search: the first child gets the full window, later
+		children a null window that only asks "is this better than the best so far?".
+		Only a child that fails high (beats the best move) is searched again
+		"""
+		# only the bound the null window is built on has to be finite
+		bound = alpha if is_ai_turn else beta
+		if first or abs(bound) == float('inf') or not self.cfg.game.aiPvs:
+			return self.choose_move(stones, move, depth, colour, alpha, beta, ply)[0]
+
+		if is_ai_turn:
+			score = self.choose_move(stones, move, depth, colour, alpha, alpha + 1, ply)[0]
+		else:
+			score = self.choose_move(stones, move, depth, colour, beta - 1, beta, ply)[0]
+
+		# the null window result is already a bound, so the re-search window can start from it
+		if alpha < score < beta:
+			if is_ai_turn:
+				score = self.choose_move(stones, move, depth, colour, score, beta, ply)[0]
+			else:
+				score = self.choose_move(stones, move, depth, colour, alpha, score, ply)[0]
+		return score
+
+
+	def _quiesce(self, stones, last_move, colour, alpha, beta, depth):
+		"""
+		quiescence search: past the horizon only forcing moves are played (wins,
+		fours, blocks of the opponent's five and captures) until the position is
+		quiet. The side to move may stand pat on the static evaluation unless it
+		has to block. Capped at depth plies and aiQuiescenceNodes nodes per leaf
+		"""
+		score = self.rules.evaluate(stones, self.ai_colour, last_move)
+		if depth <= 0 or self.qnodes >= self.cfg.game.aiQuiescenceNodes or self._is_terminal(stones, last_move):
+			return score
+		self.nodes += 1
+		self.qnodes += 1
+		if (self.deadline is not None and time.perf_counter() > self.deadline) or self.cancel.is_set():
+			raise SearchTimeout()
+
+		is_ai_turn = (colour == self.ai_colour)
+		next_colour = self.opponent_colour if is_ai_turn else self.ai_colour
+		tiles, must_block = self._forcingTiles(stones, colour, next_colour)
+		if not tiles:
+			return score
+
+		if must_block:
+			best_score = -float('inf') if is_ai_turn else float('inf')
+		else:
+			# stand pat: the side to move can always settle for the static score
+			best_score = score
+			if is_ai_turn:
+				if score >= beta:
+					return score
+				alpha = max(alpha, score)
+			else:
+				if score <= alpha:
+					return score
+				beta = min(beta, score)
+
+		for t in tiles:
+			move = Move(t, colour)
+			stones.make(move, self.rules.previewCaptures(stones, move))
+			try:
+				score = self._quiesce(stones, move, next_colour, alpha, beta, depth - 1)
+			finally:
+				stones.unmake()
+
+			if is_ai_turn:
+				best_score = max(best_score, score)
+				alpha = max(alpha, best_score)
+			else:
+				best_score = min(best_score, score)
+				beta = min(beta, best_score)
+			if beta <= alpha:
+				break
+
+		return best_score
+
+
+	def _isNoisy(self, stones, last_move):
+		"""
+		cheap test before quiescence: did the last move make a three or longer,
+		or capture? Quiet leaves are evaluated directly
+		"""
+		if last_move is None or self.cfg.game.aiQuiescenceDepth <= 0:
+			return False
+		# a board set up with place() or copied has no undo history to read
+		undo = stones.lastMoves(1)
+		if undo and undo[0][1]:
+			return True
+		return max(self.beam.runs(stones, last_move.tile, last_move.colour)) >= 3
+
+
+	def _forcingTiles(self, stones, colour, opponent):
+		"""
+		(tiles, must_block): a winning tile alone if there is one, else the blocks
+		of opponent's fives (must_block) or colour's fours, plus captures.
+		Only the lines through the last two moves are looked at, that is where
+		new threats appear
+		"""
+		reach = segments(self.cfg.board.size, 4)
+		wins, blocks, fours, captures = set(), set(), set(), set()
+		threats = stones.threats.captures(colour) if stones.threats is not None else {}
+
+		for move, _ in stones.lastMoves(2):
+			for d, segment in enumerate(reach[move.tile]):
+				for i, t in segment:
+					if t in stones.map:
+						continue
+					if move.colour == colour:
+						run = self._lineRun(stones, t, colour, d)
+						if run >= 5:
+							wins.add(t)
+						elif run == 4:
+							fours.add(t)
+					else:
+						if self._lineRun(stones, t, opponent, d) >= 5:
+							blocks.add(t)
+						# a capture of a pair holding the last move lands within two steps of it
+						if abs(i) <= 2 and t in threats:
+							captures.add(t)
+
+		if wins:
+			return [min(wins)], False
+		if blocks:
+			return sorted(blocks) + sorted(captures - blocks), True
+		return sorted(fours) + sorted(captures - fours), False
+
+
+	def _lineRun(self, stones, tile, colour, direction):
+		"""length of the run colour would have through the empty tile along DIRECTIONS[direction]"""
+		tile_rays = rays(self.cfg.board.size)[tile]
+		count = 1
+		for ray in (tile_rays[direction], tile_rays[direction + 4]):
+			for t in ray:
+				if stones.map.get(t) != colour:
+					break
+				count += 1
+		return count
+
+
+	def _ttKey(self, stones, colour) -> tuple[int, int]:
+		"""
+		transposition table key (board, capture counts and side to move) and the
+		transform to the orientation its tiles are stored in. With aiSymmetry
+		the key is canonical, so mirrored positions share entries
+		"""
+		if not self.cfg.game.aiSymmetry:
+			return stones.hash ^ sideKey(colour), 0
+		key, transform = canonicalHash(stones)
+		return key ^ sideKey(colour), transform
+
+
+	def _ttTile(self, entry, transform):
+		"""the entry's best tile in the actual orientation"""
+		if entry is None or entry.tile is None:
+			return None
+		return untransformTile(entry.tile, transform, self.cfg.board.size)
+
+
+	def _ttStore(self, key, transform, depth, flag, score, tile):
+		if tile is not None:
+			tile = transformTile(tile, transform, self.cfg.board.size)
+		self.tt.store(key, depth, flag, score, tile)
+
+
+	def _uniqueTiles(self, stones, tiles):
+		"""drop tiles that a symmetry of the position maps onto an earlier tile, they lead to the same position"""
+		symmetries = selfSymmetries(stones)
+		if not symmetries:
+			return tiles
+		size = self.cfg.board.size
+		seen = set()
+		unique = []
+		for t in tiles:
+			if t in seen:
+				continue
+			unique.append(t)
+			seen.update(transformTile(t, s, size) for s in symmetries)
+		return unique
+
+
+	def _candidates(self, stones, ply, colour, hash_tile, last_tile):
+		"""the tiles to search at a node: beam-pruned possible tiles in search order"""
+		opponent = self.opponent_colour if colour == self.ai_colour else self.ai_colour
+		tiles = self._getPossibleTiles(stones)
+		if ply == 0 and self.cfg.game.aiSymmetry:
+			tiles = self._uniqueTiles(stones, sorted(tiles))
+		tiles = self.beam.select(stones, tiles, ply, colour, opponent, hash_tile)
+		return self.ordering.order(tiles, ply, colour, hash_tile, last_tile)
+
+
 	def _is_terminal(self, stones, last_move):
-		if last_move == None:
+		if last_move is None:
 			return False
 		elif self.rules.checkWin(stones, last_move):
 			return True
+		elif self.rules.checkCaptureWin(stones, last_move):
+			return True
 		elif stones.isFull():
 			return True
 		return False
 
 
 	def _getPossibleTiles(self, stones):
-		# return all empty tiles adjacent to occupied tiles
-		occupied = set(stones.map)
-		candidates = set()
-		size = self.cfg.board.size
-		
-		for tile in occupied:
-			x, y = tile
-			for dx in [-1, 0, 1]:
-				for dy in [-1, 0, 1]:
-					if dx == 0 and dy == 0:
-						continue
-					neighbor = (x + dx, y + dy)
-					if 0 <= neighbor[0] < size and 0 <= neighbor[1] < size:
-						if neighbor not in occupied:
-							candidates.add(neighbor)
-		if not candidates:
+		# empty tiles near occupied tiles, kept up to date by Stones as moves are made
+		if not stones.frontier:
+			size = self.cfg.board.size
 			return [(size // 2, size // 2)]
-		return list(candidates)
+		return list(stones.frontier)
 
 
 		# unordered_list = list(set(stones.allMoves) - set(stones.map))
@@ -1,6 +1,28 @@
 from dataclasses import dataclass
 
-@dataclass
+@dataclass(slots=True)
 class Move:
 	tile: tuple[int, int]
-	colour: str
\ No newline at end of file
+	colour: str
+
+
+# Compact int form of tiles and colours, for tables and for passing positions
+# between processes: a tile is y * size + x, a colour is 1 (player 1) or 2
+# (player 2), with 0 for no colour.
+
+def tileIndex(tile, size) -> int:
+	return tile[1] * size + tile[0]
+
+
+def indexTile(index, size) -> tuple[int, int]:
+	return (index % size, index // size)
+
+
+def colourCode(cfg, colour) -> int:
+	if colour is None:
+		return 0
+	return 1 if colour == cfg.game.player1Colour else 2
+
+
+def codeColour(cfg, code):
+	return (None, cfg.game.player1Colour, cfg.game.player2Colour)[code]
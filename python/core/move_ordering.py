@@ -0,0 +1,74 @@
+HASH_BONUS = 1 << 40
+KILLER_BONUS = 1 << 30
+COUNTER_BONUS = 1 << 29
+
+
+class MoveOrdering:
+	"""
+	Orders candidate tiles so alpha-beta finds its cutoffs early:
+		- the transposition table move first
+		- then the two killer moves of this ply
+		- then the counter move to the opponent's last move
+		- everything else by history score
+	History and counter moves are kept per colour, so lookups are by tile alone
+	"""
+	def __init__(self, enabled=True):
+		self.enabled = enabled
+		self.killers = {}
+		self.history = {}
+		self.counters = {}
+		self.cutoffs = 0
+		self.first_cutoffs = 0
+
+
+	def newSearch(self):
+		"""Keep what was learned on the previous move but let it fade"""
+		self.killers.clear()
+		for history in self.history.values():
+			for key in history:
+				history[key] //= 2
+		self.cutoffs = 0
+		self.first_cutoffs = 0
+
+
+	def order(self, tiles, ply, colour, hash_tile=None, last_tile=None):
+		if not self.enabled:
+			return tiles
+
+		killers = self.killers.get(ply, ())
+		counter = self.counters.get(colour, {}).get(last_tile)
+		history = self.history.get(colour, {})
+
+		def score(t):
+			if t == hash_tile:
+				return HASH_BONUS
+			if t in killers:
+				return KILLER_BONUS - killers.index(t)
+			if t == counter:
+				return COUNTER_BONUS
+			return history.get(t, 0)
+
+		return sorted(tiles, key=score, reverse=True)
+
+
+	def recordCutoff(self, tile, ply, colour, depth, last_tile, index):
+		"""tile caused a beta cutoff after index earlier siblings were searched"""
+		self.cutoffs += 1
+		if index == 0:
+			self.first_cutoffs += 1
+
+		killers = self.killers.setdefault(ply, [])
+		if tile not in killers:
+			killers.insert(0, tile)
+			del killers[2:]
+
+		history = self.history.setdefault(colour, {})
+		history[tile] = history.get(tile, 0) + depth * depth
+		if last_tile is not None:
+			self.counters.setdefault(colour, {})[last_tile] = tile
+
+
+	def firstCutoffRate(self):
+		if self.cutoffs == 0:
+			return 0.0
+		return self.first_cutoffs / self.cutoffs
@@ -1,5 +1,7 @@
 from config import Config
 from core.move import Move
+from core.shapes import shapes, RUN, FREE_THREE, FREE_FOUR
+from core.geometry import rays
 
 
 class MoveRules:
@@ -26,34 +28,27 @@ def validateMove(self, stones, move):
                 if distance < 3:
                     return False, "Second move must be at least 3 spaces from center!"
 
-        if self.cfg.game.difficulty == "pro":
-            black_colour = self.cfg.colour.black
-            if move.colour == black_colour:
-                stones.map[move.tile] = move.colour
+        pro_black = self.cfg.game.difficulty == "pro" and move.colour == self.cfg.colour.black
+        if not pro_black and not self.cfg.game.noDoubleThrees:
+            return True, None
 
-                if self._wouldCreateOverline(stones, move):
-                    del stones.map[move.tile]
-                    return False, "Black cannot create overline (6+)!"
+        # one table lookup per direction gives every shape the move makes
+        line_shapes = shapes(stones, move.tile, move.colour)
+        free_three_count = sum(1 for entry in line_shapes if entry & FREE_THREE)
 
-                free_three_count = self.countFreeThrees(stones, move)
-                if free_three_count >= 2:
-                    del stones.map[move.tile]
-                    return False, "Black cannot create double-three!"
+        if pro_black:
+            if any((entry & RUN) >= 6 for entry in line_shapes):
+                return False, "Black cannot create overline (6+)!"
 
-                free_four_count = self.countFreeFours(stones, move)
-                if free_four_count >= 2:
-                    del stones.map[move.tile]
-                    return False, "Black cannot create double-four!"
-
-                del stones.map[move.tile]
+            if free_three_count >= 2:
+                return False, "Black cannot create double-three!"
 
-        if self.cfg.game.noDoubleThrees:
-            stones.map[move.tile] = move.colour
-            free_three_count = self.countFreeThrees(stones, move)
-            del stones.map[move.tile]
+            free_four_count = sum(1 for entry in line_shapes if entry & FREE_FOUR)
+            if free_four_count >= 2:
+                return False, "Black cannot create double-four!"
 
-            if free_three_count >= 2:
-                return False, "Cannot create double free-threes!"
+        if self.cfg.game.noDoubleThrees and free_three_count >= 2:
+            return False, "Cannot create double free-threes!"
 
         return True, None
 
@@ -71,6 +66,14 @@ def getCaptures(self, stones, move) -> list[Move]:
         return self._calculateCaptures(stones, move)
 
 
+    def previewCaptures(self, stones, move) -> list[Move]:
+        """Captures move would make, before it is placed (for make/unmake in the search)"""
+        if self.cfg.game.difficulty not in ["ninuki", "pente"]:
+            return []
+
+        return self._calculateCaptures(stones, move)
+
+
     def _calculateCaptures(self, stones, move) -> list[Move]:
         """Calculate captures for a move (helper method that doesn't check if stone is placed)"""
         captures = []
@@ -82,215 +85,34 @@ def _calculateCaptures(self, stones, move) -> list[Move]:
             white_color = self.cfg.colour.white
             opponent_color = black_color if move.colour == white_color else white_color
 
-        directions = [(0, 1), (1, 0), (1, 1), (1, -1)]  # horizontal, vertical, diagonal
-        x, y = move.tile
-
-        for dx, dy in directions:
-            nx1, ny1 = x + dx, y + dy
-            nx2, ny2 = x + 2*dx, y + 2*dy
-            nx3, ny3 = x + 3*dx, y + 3*dy
-
-            if (0 <= nx1 < self.cfg.board.size and 0 <= ny1 < self.cfg.board.size and
-                0 <= nx2 < self.cfg.board.size and 0 <= ny2 < self.cfg.board.size and
-                0 <= nx3 < self.cfg.board.size and 0 <= ny3 < self.cfg.board.size and
-                stones.map.get((nx1, ny1)) == opponent_color and
-                stones.map.get((nx2, ny2)) == opponent_color and
-                stones.map.get((nx3, ny3)) == move.colour):
-                captures.append(Move((nx1, ny1), opponent_color))
-                captures.append(Move((nx2, ny2), opponent_color))
-
-            nx1, ny1 = x - dx, y - dy
-            nx2, ny2 = x - 2*dx, y - 2*dy
-            nx3, ny3 = x - 3*dx, y - 3*dy
-
-            if (0 <= nx1 < self.cfg.board.size and 0 <= ny1 < self.cfg.board.size and
-                0 <= nx2 < self.cfg.board.size and 0 <= ny2 < self.cfg.board.size and
-                0 <= nx3 < self.cfg.board.size and 0 <= ny3 < self.cfg.board.size and
-                stones.map.get((nx1, ny1)) == opponent_color and
-                stones.map.get((nx2, ny2)) == opponent_color and
-                stones.map.get((nx3, ny3)) == move.colour):
-                captures.append(Move((nx1, ny1), opponent_color))
-                captures.append(Move((nx2, ny2), opponent_color))
+        if stones.bits is not None:
+            return [Move(tile, opponent_color) for tile in stones.bits.captures(move.tile, move.colour)]
 
-        return captures
+        # only the eight rays out of the placed stone: X O O X
+        occupied = stones.map
 
+        for ray in rays(self.cfg.board.size)[move.tile]:
+            if len(ray) < 3 or occupied.get(ray[2]) != move.colour:
+                continue
 
-    def _isFreeThree(self, stones, move, direction):
-        """
-        A free-three is a pattern of 3 stones (including gaps) that can develop into a four
-        """
-        dx, dy = direction
-        x, y = move.tile
-        colour = move.colour
-
-        positions = []
-
-        for i in range(1, 6):
-            nx, ny = x + i * dx, y + i * dy
-            if not (0 <= nx < self.cfg.board.size and 0 <= ny < self.cfg.board.size):
-                break
-            stone_colour = stones.map.get((nx, ny))
-            if stone_colour == colour:
-                positions.append(i)
-            elif stone_colour is not None:
-                # Opponent stone blocks this direction
-                break
-
-        backward_positions = []
-        for i in range(1, 6):
-            nx, ny = x - i * dx, y - i * dy
-            if not (0 <= nx < self.cfg.board.size and 0 <= ny < self.cfg.board.size):
-                break
-            stone_colour = stones.map.get((nx, ny))
-            if stone_colour == colour:
-                backward_positions.append(-i)
-            elif stone_colour is not None:
-                # Opponent stone blocks this direction
-                break
-
-        all_positions = sorted(backward_positions + [0] + positions)
-
-        if len(all_positions) != 3:
-            return False
-
-        span = all_positions[-1] - all_positions[0]
-        if span > 4:
-            return False
-
-        forward_end_x = x + (all_positions[-1] + 1) * dx
-        forward_end_y = y + (all_positions[-1] + 1) * dy
-
-        backward_end_x = x + (all_positions[0] - 1) * dx
-        backward_end_y = y + (all_positions[0] - 1) * dy
-
-        forward_empty = (
-            0 <= forward_end_x < self.cfg.board.size and
-            0 <= forward_end_y < self.cfg.board.size and
-            (forward_end_x, forward_end_y) not in stones.map
-        )
-
-        backward_empty = (
-            0 <= backward_end_x < self.cfg.board.size and
-            0 <= backward_end_y < self.cfg.board.size and
-            (backward_end_x, backward_end_y) not in stones.map
-        )
-
-        return forward_empty and backward_empty
+            first, second = ray[0], ray[1]
+            if occupied.get(first) == opponent_color and occupied.get(second) == opponent_color:
+                captures.append(Move(first, opponent_color))
+                captures.append(Move(second, opponent_color))
+
+        return captures
 
 
     def countFreeThrees(self, stones, move):
         """Count the number of free-three patterns created by a move"""
-        directions = [(0, 1), (1, 0), (1, 1), (1, -1)]
-        count = 0
-
-        for direction in directions:
-            if self._isFreeThree(stones, move, direction):
-                count += 1
-
-        return count
-
-
-    def _wouldCreateOverline(self, stones, move):
-        """Check if a move would create 6 or more in a row (overline)"""
-        directions = [(0, 1), (1, 0), (1, 1), (1, -1)]
-        x, y = move.tile
-        colour = move.colour
-
-        for dx, dy in directions:
-            count = 1
-
-            nx, ny = x + dx, y + dy
-            while 0 <= nx < self.cfg.board.size and 0 <= ny < self.cfg.board.size:
-                if stones.map.get((nx, ny)) == colour:
-                    count += 1
-                    nx += dx
-                    ny += dy
-                else:
-                    break
-
-            nx, ny = x - dx, y - dy
-            while 0 <= nx < self.cfg.board.size and 0 <= ny < self.cfg.board.size:
-                if stones.map.get((nx, ny)) == colour:
-                    count += 1
-                    nx -= dx
-                    ny -= dy
-                else:
-                    break
-
-            if count >= 6:
-                return True
-
-        return False
-
-
-    def _isFreeFour(self, stones, move, direction):
-        """
-        A free-four is a pattern of 4 stones that can immediately win on the next move
-        """
-        dx, dy = direction
-        x, y = move.tile
-        colour = move.colour
-
-        positions = []
-
-        for i in range(1, 6):
-            nx, ny = x + i * dx, y + i * dy
-            if not (0 <= nx < self.cfg.board.size and 0 <= ny < self.cfg.board.size):
-                break
-            stone_colour = stones.map.get((nx, ny))
-            if stone_colour == colour:
-                positions.append(i)
-            elif stone_colour is not None:
-                break
-
-        backward_positions = []
-        for i in range(1, 6):
-            nx, ny = x - i * dx, y - i * dy
-            if not (0 <= nx < self.cfg.board.size and 0 <= ny < self.cfg.board.size):
-                break
-            stone_colour = stones.map.get((nx, ny))
-            if stone_colour == colour:
-                backward_positions.append(-i)
-            elif stone_colour is not None:
-                break
-
-        all_positions = sorted(backward_positions + [0] + positions)
-
-        if len(all_positions) != 4:
-            return False
-
-        span = all_positions[-1] - all_positions[0]
-        if span > 4:
-            return False
-
-        forward_end_x = x + (all_positions[-1] + 1) * dx
-        forward_end_y = y + (all_positions[-1] + 1) * dy
-
-        backward_end_x = x + (all_positions[0] - 1) * dx
-        backward_end_y = y + (all_positions[0] - 1) * dy
-
-        forward_empty = (
-            0 <= forward_end_x < self.cfg.board.size and
-            0 <= forward_end_y < self.cfg.board.size and
-            (forward_end_x, forward_end_y) not in stones.map
-        )
-
-        backward_empty = (
-            0 <= backward_end_x < self.cfg.board.size and
-            0 <= backward_end_y < self.cfg.board.size and
-            (backward_end_x, backward_end_y) not in stones.map
-        )
-
-        return forward_empty and backward_empty
+        return sum(1 for entry in shapes(stones, move.tile, move.colour) if entry & FREE_THREE)
 
 
     def countFreeFours(self, stones, move):
         """Count the number of free-four patterns created by a move"""
-        directions = [(0, 1), (1, 0), (1, 1), (1, -1)]
-        count = 0
+        return sum(1 for entry in shapes(stones, move.tile, move.colour) if entry & FREE_FOUR)
 
-        for direction in directions:
-            if self._isFreeFour(stones, move, direction):
-                count += 1
 
-        return count
+    def _wouldCreateOverline(self, stones, move):
+        """Check if a move would create 6 or more in a row (overline)"""
+        return any((entry & RUN) >= 6 for entry in shapes(stones, move.tile, move.colour))
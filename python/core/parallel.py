@@ -0,0 +1,197 @@
+import os
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor, wait
+from dataclasses import fields
+from config import Config, GameConfig
+from core.move import Move, tileIndex, indexTile, colourCode, codeColour
+
+
+# Root-parallel search: the root candidates are split across worker processes,
+# each searching its share with the best root score found so far (shared
+# through a multiprocessing Value) as its alpha bound.
+
+# settings outside the ai* fields that change how a worker's engine plays or runs
+ENGINE_SETTINGS = ("captureWinCount", "boardBackend")
+
+_pools = {}
+_shared_alpha = None
+_shared_stop = None
+_worker_engines = {}
+
+
+def encodeBoard(cfg, stones, last_move):
+	"""Compact, picklable board: one byte per tile (0 empty, 1 player1, 2 player2)"""
+	size = cfg.board.size
+	board = bytearray(size * size)
+	for tile, colour in stones.map.items():
+		board[tileIndex(tile, size)] = colourCode(cfg, colour)
+
+	captures = (stones.captures.get(cfg.game.player1Colour, 0), stones.captures.get(cfg.game.player2Colour, 0))
+	last = None
+	if last_move is not None:
+		last = (tileIndex(last_move.tile, size), colourCode(cfg, last_move.colour))
+
+	settings = {f.name: getattr(cfg.game, f.name) for f in fields(GameConfig) if f.name.startswith("ai") or f.name in ENGINE_SETTINGS}
+	# params is used as a dict key in the workers, so dict settings go as sorted items
+	settings = {k: tuple(sorted(v.items())) if isinstance(v, dict) else v for k, v in settings.items()}
+	params = (size, cfg.game.difficulty, cfg.game.noDoubleThrees, tuple(sorted(settings.items())))
+	return params, bytes(board), captures, last
+
+
+def decodeBoard(cfg, board, captures, last):
+	from ui.stones import Stones
+
+	size = cfg.board.size
+	stones = Stones(cfg)
+	for index, code in enumerate(board):
+		if code:
+			stones.place(Move(indexTile(index, size), codeColour(cfg, code)))
+	stones.addCaptures(codeColour(cfg, 1), captures[0])
+	stones.addCaptures(codeColour(cfg, 2), captures[1])
+
+	last_move = None
+	if last is not None:
+		index, code = last
+		last_move = Move(indexTile(index, size), codeColour(cfg, code))
+	return stones, last_move
+
+
+class _SharedFlag:
+	"""Minimax.cancel stand-in inside a worker, set by the parent through shared memory"""
+	def __init__(self, value):
+		self.value = value
+
+	def is_set(self):
+		return self.value.value != 0
+
+
+def _initWorker(shared_alpha, shared_stop):
+	global _shared_alpha, _shared_stop
+	_shared_alpha = shared_alpha
+	_shared_stop = shared_stop
+
+
+def _makeConfig(params):
+	size, difficulty, no_double_threes, settings = params
+	cfg = Config()
+	cfg.board.size = size
+	cfg.game.difficulty = difficulty
+	cfg.game.noDoubleThrees = no_double_threes
+	for key, value in settings:
+		if isinstance(getattr(cfg.game, key), dict):
+			value = dict(value)
+		setattr(cfg.game, key, value)
+	return cfg
+
+
+def _searchShare(params, board, captures, last, ai_code, root_tiles, depth, deadline):
+	"""
+	Worker entry point: search each (index, tile) root move to depth and return
+	[(index, score)], or None if the deadline passed before the share was done,
+	along with the worker's node and cutoff counts
+	"""
+	from core.rules import Rules
+	from core.minmax import Minimax, SearchTimeout
+
+	key = (params, ai_code)
+	if key not in _worker_engines:
+		cfg = _makeConfig(params)
+		_worker_engines[key] = Minimax(cfg, Rules(cfg), codeColour(cfg, ai_code), codeColour(cfg, 3 - ai_code))
+		_worker_engines[key].cancel = _SharedFlag(_shared_stop)
+	minimax = _worker_engines[key]
+
+	stones, _ = decodeBoard(minimax.cfg, board, captures, last)
+	minimax.tt.newSearch()
+	minimax.ordering.newSearch()
+	minimax.nodes = 0
+	minimax.deadline = time.perf_counter() + (deadline - time.time())
+
+	results = []
+	try:
+		for index, tile in root_tiles:
+			# alpha - 1 keeps moves that tie the best score exact, so the merge is deterministic
+			alpha = _shared_alpha.value
+			move = Move(tile, minimax.ai_colour)
+			stones.make(move, minimax.rules.previewCaptures(stones, move))
+			try:
+				score, _ = minimax.choose_move(stones, move, depth - 1, minimax.opponent_colour, alpha - 1, float('inf'), 1)
+			finally:
+				stones.unmake()
+			results.append((index, score))
+
+			with _shared_alpha.get_lock():
+				if score > _shared_alpha.value:
+					_shared_alpha.value = score
+	except SearchTimeout:
+		results = None
+	finally:
+		minimax.deadline = None
+	stats = (minimax.nodes, minimax.ordering.cutoffs, minimax.ordering.first_cutoffs)
+	return results, stats
+
+
+class ParallelRoot:
+	"""Splits the root moves of one iteration across a process pool"""
+	def __init__(self, workers):
+		self.workers = workers
+
+
+	def _pool(self):
+		if self.workers not in _pools:
+			context = multiprocessing.get_context("spawn")
+			shared_alpha = context.Value('d', -float('inf'))
+			shared_stop = context.Value('b', 0, lock=False)
+			pool = ProcessPoolExecutor(
+				max_workers=self.workers,
+				mp_context=context,
+				initializer=_initWorker,
+				initargs=(shared_alpha, shared_stop),
+			)
+			_pools[self.workers] = (pool, shared_alpha, shared_stop)
+		return _pools[self.workers]
+
+
+	def search(self, cfg, stones, last_move, ai_colour, root_tiles, depth, deadline, cancel):
+		"""
+		Search the root moves in parallel; deadline is a time.time() timestamp and
+		setting the cancel event stops the workers early.
+		Returns (score, tile, stats), with tile None if any worker was stopped.
+		stats sums (nodes, cutoffs, first move cutoffs) over the workers
+		"""
+		pool, shared_alpha, shared_stop = self._pool()
+		shared_stop.value = 0
+		with shared_alpha.get_lock():
+			shared_alpha.value = -float('inf')
+
+		params, board, captures, last = encodeBoard(cfg, stones, last_move)
+		ai_code = colourCode(cfg, ai_colour)
+		indexed = list(enumerate(root_tiles))
+		# round-robin so every worker gets some of the best-ordered moves early
+		shares = [indexed[i::self.workers] for i in range(self.workers)]
+		futures = [
+			pool.submit(_searchShare, params, board, captures, last, ai_code, share, depth, deadline)
+			for share in shares if share
+		]
+
+		while wait(futures, timeout=0.05).not_done:
+			if cancel.is_set():
+				shared_stop.value = 1
+
+		scores = {}
+		stats = (0, 0, 0)
+		timed_out = False
+		for future in futures:
+			results, worker_stats = future.result()
+			stats = tuple(a + b for a, b in zip(stats, worker_stats))
+			if results is None:
+				timed_out = True
+			else:
+				scores.update(results)
+
+		if timed_out:
+			return None, None, stats
+		# highest score wins, ties go to the earliest move in root order
+		best_index = max(scores, key=lambda i: (scores[i], -i))
+		return scores[best_index], root_tiles[best_index], stats
@@ -0,0 +1,336 @@
+import os
+import sqlite3
+import threading
+import time
+from core.move import Move, tileIndex, indexTile
+from core.book import positionKey
+from core.symmetry import transformTile, untransformTile
+from core.beam import Beam
+from core.geometry import segments
+
+
+WIN, DRAW, LOSS = 1, 0, -1
+INF = float('inf')
+
+
+# solved positions are learnt at run time, so they go in the user's cache, not the source tree
+SOLVED_DIR = os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "gomoku")
+
+
+def storePath(difficulty, size):
+	return os.path.join(SOLVED_DIR, f"{difficulty}-{size}.solved")
+
+
+class SolvedStore:
+	"""
+	Proven positions on disk (sqlite): canonical position key with the side to
+	move -> (result for the side to move, best tile index in the canonical
+	orientation, or -1 when there is no particular move)
+	"""
+	def __init__(self, path):
+		self.lock = threading.Lock()
+		os.makedirs(os.path.dirname(path), exist_ok=True)
+		self.db = sqlite3.connect(path, check_same_thread=False)
+		self.db.execute("CREATE TABLE IF NOT EXISTS solved (key INTEGER PRIMARY KEY, result INTEGER, tile INTEGER)")
+
+
+	@staticmethod
+	def _signed(key):
+		"""sqlite integers are signed 64-bit"""
+		return key - (1 << 64) if key >= (1 << 63) else key
+
+
+	def get(self, key) -> tuple[int, int] | None:
+		with self.lock:
+			row = self.db.execute("SELECT result, tile FROM solved WHERE key = ?", (self._signed(key),)).fetchone()
+		return row
+
+
+	def put(self, key, result, tile):
+		with self.lock:
+			self.db.execute("INSERT OR REPLACE INTO solved VALUES (?, ?, ?)", (self._signed(key), result, tile))
+
+
+	def commit(self):
+		with self.lock:
+			self.db.commit()
+
+
+	def __len__(self):
+		with self.lock:
+			return self.db.execute("SELECT COUNT(*) FROM solved").fetchone()[0]
+
+
+class _Node:
+	__slots__ = ("tile", "parent", "children", "pn", "dn")
+
+	def __init__(self, tile, parent):
+		self.tile = tile
+		self.parent = parent
+		self.children = None
+		self.pn = 1
+		self.dn = 1
+
+
+class ProofNumberSolver:
+	"""
+	Proof-number search for boards small enough to solve outright.
+	One pass proves or disproves "attacker wins"; solve() runs it for the side
+	to move and then for the opponent, giving won / lost / drawn.
+	Both sides get every legal move, so disproofs are sound too.
+
+	Proven positions go into a SolvedStore keyed by canonical position, which
+	later searches (in this run or the next) read as known leaves.
+	"""
+	def __init__(self, cfg, rules, store=None):
+		self.cfg = cfg
+		self.rules = rules
+		self.store = store
+		self.beam = Beam(cfg)
+		self.nodes = 0
+		self.settled = {}
+
+
+	def lookup(self, stones, colour) -> tuple[int, tuple[int, int] | None] | None:
+		"""(result, tile) for colour to move from the store, tile in the actual orientation"""
+		if self.store is None:
+			return None
+		key, transform = positionKey(stones, colour)
+		found = self.store.get(key)
+		if found is None:
+			return None
+		result, index = found
+		size = self.cfg.board.size
+		tile = untransformTile(indexTile(index, size), transform, size) if index >= 0 else None
+		return result, tile
+
+
+	def solve(self, stones, colour, opponent, max_nodes=None, time_limit=None, cancel=None):
+		"""
+		(result, tile) for colour to move, or None if the budget ran out first.
+		tile is a winning or drawing move, or when lost the one whose refutation
+		took the largest proof tree
+		"""
+		known = self.lookup(stones, colour)
+		if known is not None:
+			return known
+
+		if max_nodes is None:
+			max_nodes = self.cfg.game.aiSolveNodes
+		if time_limit is None:
+			time_limit = self.cfg.game.aiSolveTime
+		self.deadline = time.perf_counter() + time_limit
+		self.cancel = cancel
+		self.nodes = 0
+		self.settled = {}
+		board = stones.copy()
+
+		try:
+			root = self._prove(board, colour, colour, opponent, max_nodes)
+			if root.pn == 0:
+				return self._record(board, colour, WIN, self._pick(root, lambda c: c.pn == 0))
+			if root.dn != 0:
+				return None
+
+			root = self._prove(board, colour, opponent, colour, max_nodes)
+			if root.pn == 0:
+				return self._record(board, colour, LOSS, self._pick(root, lambda c: True, key=lambda c: -self._size(c)))
+			if root.dn == 0:
+				return self._record(board, colour, DRAW, self._pick(root, lambda c: c.dn == 0))
+			return None
+		finally:
+			# subtrees proven on the way are kept even when the root is not
+			if self.store is not None:
+				self.store.commit()
+
+
+	def _pick(self, root, accept, key=None):
+		children = [c for c in root.children or [] if accept(c)]
+		if not children:
+			return None
+		return min(children, key=key).tile if key else children[0].tile
+
+
+	@staticmethod
+	def _size(node):
+		"""number of nodes in node's subtree: how much it took to prove"""
+		count, stack = 0, [node]
+		while stack:
+			n = stack.pop()
+			count += 1
+			stack.extend(n.children or ())
+		return count
+
+
+	def _record(self, stones, colour, result, tile):
+		self._store(stones, colour, result, tile)
+		return result, tile
+
+
+	def _store(self, stones, colour, result, tile):
+		if self.store is None:
+			return
+		key, transform = positionKey(stones, colour)
+		size = self.cfg.board.size
+		index = -1
+		if tile is not None:
+			index = tileIndex(transformTile(tile, transform, size), size)
+		self.store.put(key, result, index)
+
+
+	def _prove(self, stones, to_move, attacker, defender, max_nodes) -> _Node:
+		"""One proof-number search of "attacker wins" from stones with to_move to play"""
+		root = _Node(None, None)
+		colours = {attacker: defender, defender: attacker}
+
+		while root.pn != 0 and root.dn != 0 and self.nodes < max_nodes:
+			if time.perf_counter() > self.deadline or (self.cancel is not None and self.cancel.is_set()):
+				break
+
+			# walk down to the most proving node
+			node, colour = root, to_move
+			while node.children:
+				if colour == attacker:
+					node = min(node.children, key=lambda c: c.pn)
+				else:
+					node = min(node.children, key=lambda c: c.dn)
+				stones.make(Move(node.tile, colour), self.rules.previewCaptures(stones, Move(node.tile, colour)))
+				colour = colours[colour]
+
+			self._expand(stones, node, colour, attacker, colours)
+
+			# back up the new numbers, undoing the path
+			while True:
+				self._update(node, colour == attacker)
+				if node.pn == 0 or node.dn == 0:
+					self._settle(stones, node, colour, attacker)
+				if node.parent is None:
+					break
+				stones.unmake()
+				node, colour = node.parent, colours[colour]
+
+		return root
+
+
+	def _settle(self, stones, node, colour, attacker):
+		"""remember a proven or disproven node for transpositions, and store the proofs"""
+		key, _ = positionKey(stones, colour)
+		self.settled[(key, attacker)] = node.pn == 0
+		if node.pn == 0 and colour == attacker and node.parent is not None:
+			self._store(stones, colour, WIN, self._pick(node, lambda c: c.pn == 0))
+		elif node.pn == 0 and colour != attacker:
+			self._store(stones, colour, LOSS, None)
+
+
+	def _expand(self, stones, node, colour, attacker, colours):
+		self.nodes += 1
+		opponent = colours[colour]
+		node.children = []
+		for tile in self._legalTiles(stones, colour, opponent):
+			move = Move(tile, colour)
+			child = _Node(tile, node)
+			stones.make(move, self.rules.previewCaptures(stones, move))
+			try:
+				attacker_wins = self._leaf(stones, move, opponent, attacker)
+			finally:
+				stones.unmake()
+
+			if attacker_wins is True:
+				child.pn, child.dn = 0, INF
+			elif attacker_wins is False:
+				child.pn, child.dn = INF, 0
+			node.children.append(child)
+
+			# one winning move settles an attacker node
+			if child.pn == 0 and colour == attacker:
+				break
+
+
+	def _leaf(self, stones, move, to_move, attacker) -> bool | None:
+		"""does attacker win after move, with to_move to play? None if unknown"""
+		if self.rules.checkWin(stones, move):
+			winner = self._fiveWinner(stones, move, to_move)
+			if winner is not None:
+				return winner == attacker
+		elif self.rules.checkCaptureWin(stones, move):
+			return move.colour == attacker
+		if stones.isFull():
+			return False
+		if self._immediateWin(stones, to_move):
+			return to_move == attacker
+		if not self._canStillWin(stones, attacker):
+			return False
+
+		key, _ = positionKey(stones, to_move)
+		if (key, attacker) in self.settled:
+			return self.settled[(key, attacker)]
+		known = self.lookup(stones, to_move)
+		if known is None:
+			return None
+		result = known[0]
+		return result != DRAW and (result == WIN) == (to_move == attacker)
+
+
+	def _fiveWinner(self, stones, move, to_move):
+		"""
+		who move's five wins the game for, ruled as Game does: in ninuki and
+		pente to_move may break it by capture, winning outright if that takes
+		it to captureWinCount. None when the five can be broken and play goes on
+		"""
+		if self.cfg.game.difficulty not in ["ninuki", "pente"]:
+			return move.colour
+		tiles = self.rules.getWinningTiles(stones, move)
+		if not self.rules.canOpponentBreakLine(stones, tiles, to_move):
+			return move.colour
+		if self.rules.wouldOpponentWinByCapture(stones, tiles, to_move, stones.captures.get(to_move, 0)):
+			return to_move
+		return None
+
+
+	def _canStillWin(self, stones, colour):
+		"""
+		is there a line of five with no opposing stone left? Without captures
+		a position where every line is blocked for colour is not a win for it
+		"""
+		if self.cfg.game.difficulty in ["ninuki", "pente"]:
+			return True
+		return stones.windows.open(stones.windows.side(colour))
+
+
+	def _immediateWin(self, stones, colour):
+		"""
+		can colour complete five right away? Only the lines through its own
+		last stone are looked at, older fours were answered further up the tree.
+		With captures a five need not win, so _leaf rules on it instead
+		"""
+		if self.cfg.game.difficulty in ["ninuki", "pente"]:
+			return False
+		moves = stones.lastMoves(2)
+		if len(moves) < 2:
+			return False
+		for segment in segments(self.cfg.board.size, 4)[moves[0][0].tile]:
+			for _, t in segment:
+				if t in stones.map:
+					continue
+				move = Move(t, colour)
+				if self.rules.checkWin(stones, move) and self.rules.validateMove(stones, move)[0]:
+					return True
+		return False
+
+
+	def _update(self, node, is_or):
+		if not node.children:
+			# no legal move: nobody wins from here
+			node.pn, node.dn = INF, 0
+		elif is_or:
+			node.pn = min(c.pn for c in node.children)
+			node.dn = sum(c.dn for c in node.children)
+		else:
+			node.pn = sum(c.pn for c in node.children)
+			node.dn = min(c.dn for c in node.children)
+
+
+	def _legalTiles(self, stones, colour, opponent):
+		"""every empty tile the rules allow, most threatening first (ties are expanded in order)"""
+		tiles = [t for t in stones.allMoves if t not in stones.map and self.rules.validateMove(stones, Move(t, colour))[0]]
+		return sorted(tiles, key=lambda t: -self.beam.score(stones, t, colour, opponent)[0])
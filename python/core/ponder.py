@@ -0,0 +1,71 @@
+import threading
+from config import Config
+from core.move import Move
+from core.zobrist import sideKey
+
+
+class Ponderer:
+	"""
+	Searches on the opponent's time: after the AI has moved, a background thread
+	guesses the opponent's most likely replies and searches the AI's answer to
+	each one. Finished results are cached by position, so if the opponent plays
+	a pondered move the AI can answer straight away.
+
+	It reuses the AI's Minimax (and its transposition table), which is safe
+	because stop() always joins the thread before the AI searches itself.
+	"""
+	def __init__(self, cfg, rules, minimax):
+		self.cfg = cfg
+		self.rules = rules
+		self.minimax = minimax
+		self.cache = {}
+		self.thread = None
+
+
+	def start(self, stones):
+		"""stones is the position after the AI's move, with the opponent to play"""
+		self.stop()
+		self.cache = {}
+		self.thread = threading.Thread(target=self._run, args=(stones.copy(),), daemon=True)
+		self.thread.start()
+
+
+	def stop(self):
+		if self.thread is None:
+			return
+		self.minimax.cancel.set()
+		self.thread.join()
+		self.minimax.cancel.clear()
+		self.thread = None
+
+
+	def lookup(self, stones) -> tuple[int, tuple[int, int]] | None:
+		"""The pondered (score, tile) for this position with the AI to move, if any"""
+		return self.cache.get(stones.hash ^ sideKey(self.minimax.ai_colour))
+
+
+	def _run(self, board):
+		opponent = self.minimax.opponent_colour
+		for reply in self._predict(board):
+			if self.minimax.cancel.is_set():
+				return
+
+			move = Move(reply, opponent)
+			board.make(move, self.rules.previewCaptures(board, move))
+			try:
+				result = self.minimax.search(board, move)
+				# a cancelled search only holds a shallow iteration, don't keep it
+				if result[1] is not None and not self.minimax.cancel.is_set():
+					self.cache[board.hash ^ sideKey(self.minimax.ai_colour)] = result
+			finally:
+				board.unmake()
+
+
+	def _predict(self, board):
+		"""Most likely replies: the AI's own expected reply (from the TT) first, then move ordering"""
+		opponent = self.minimax.opponent_colour
+		key, transform = self.minimax._ttKey(board, opponent)
+		hash_tile = self.minimax._ttTile(self.minimax.tt.probe(key), transform)
+
+		tiles = self.minimax._candidates(board, 1, opponent, hash_tile, None)
+		return tiles[:self.cfg.game.aiPonderReplies]
@@ -20,6 +20,9 @@ def validateMove(self, stones, move):
     def getCaptures(self, stones, move) -> list[Move]:
         return self.move_rules.getCaptures(stones, move)
 
+    def previewCaptures(self, stones, move) -> list[Move]:
+        return self.move_rules.previewCaptures(stones, move)
+
     def _calculateCaptures(self, stones, move) -> list[Move]:
         return self.move_rules._calculateCaptures(stones, move)
 
@@ -30,6 +33,9 @@ def countFreeThrees(self, stones, move):
     def checkWin(self, stones, move):
         return self.win_rules.checkWin(stones, move)
 
+    def checkCaptureWin(self, stones, move):
+        return self.win_rules.checkCaptureWin(stones, move)
+
     def getWinningTiles(self, stones, move):
         return self.win_rules.getWinningTiles(stones, move)
 
@@ -42,6 +48,9 @@ def wouldOpponentWinByCapture(self, stones, winning_tiles, opponent_colour, oppo
     def evaluate(self, stones, ai_colour, move):
         return self.win_rules.evaluate(stones, ai_colour, move)
 
+    def captureScore(self, stones, ai_colour):
+        return self.win_rules._captureScore(stones, ai_colour)
+
     def check_four_in_a_row(self, stones, colour):
         return self.win_rules.check_four_in_a_row(stones, colour)
 
@@ -0,0 +1,84 @@
+from functools import lru_cache
+from core.geometry import lines
+
+
+# Line shapes through a move: the five cells on each side of the tile, in the
+# order of SPAN, each one EMPTY, OWN (the mover's colour) or BLOCKED (the
+# opponent's stone or off the board), read as a base-3 number. The table
+# entry for that number holds the length of the mover's run through the tile
+# and whether the line makes a free three or a free four.
+SPAN = (-5, -4, -3, -2, -1, 1, 2, 3, 4, 5)
+EMPTY, OWN, BLOCKED = 0, 1, 2
+
+RUN = 0x0f
+FREE_THREE = 0x10
+FREE_FOUR = 0x20
+
+
+@lru_cache(maxsize=None)
+def shapeTable() -> bytes:
+	"""entry for every shape index, built on first use"""
+	table = bytearray(3 ** len(SPAN))
+	for index in range(len(table)):
+		cells = {0: OWN}
+		rest = index
+		for p in reversed(SPAN):
+			cells[p] = rest % 3
+			rest //= 3
+		table[index] = _run(cells) | (FREE_THREE if _isFree(cells, 3) else 0) | (FREE_FOUR if _isFree(cells, 4) else 0)
+	return bytes(table)
+
+
+def _run(cells):
+	run = 1
+	for step in (1, -1):
+		p = step
+		while p in cells and cells[p] == OWN:
+			run += 1
+			p += step
+	return run
+
+
+def _isFree(cells, stones):
+	"""
+	stones of the mover's (gaps allowed, up to the first blocked cell each
+	way) within five tiles, with an empty tile on both sides of them
+	"""
+	positions = [0]
+	for step in (1, -1):
+		for i in range(1, 6):
+			if cells[i * step] == BLOCKED:
+				break
+			if cells[i * step] == OWN:
+				positions.append(i * step)
+	if len(positions) != stones:
+		return False
+	low, high = min(positions), max(positions)
+	if high - low > 4:
+		return False
+	return cells[low - 1] == EMPTY and cells[high + 1] == EMPTY
+
+
+@lru_cache(maxsize=None)
+def lineCells(size) -> dict[tuple[int, int], tuple[tuple, ...]]:
+	"""tile -> for each direction, the tiles at SPAN from it (None when off the board)"""
+	return {tile: tuple(line[:5] + line[6:] for line in directions) for tile, directions in lines(size, 5).items()}
+
+
+def shapes(stones, tile, colour) -> list[int]:
+	"""table entries of colour playing tile, one per direction"""
+	table = shapeTable()
+	if stones.bits is not None:
+		return [table[index] for index in stones.bits.shapeIndices(tile, colour)]
+	occupied = stones.map
+	result = []
+	for line in lineCells(stones.cfg.board.size)[tile]:
+		index = 0
+		for t in line:
+			if t is None:
+				index = index * 3 + BLOCKED
+			else:
+				c = occupied.get(t)
+				index = index * 3 + (EMPTY if c is None else OWN if c == colour else BLOCKED)
+		result.append(table[index])
+	return result
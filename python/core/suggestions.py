@@ -1,5 +1,6 @@
 from config import Config
 from core.move import Move
+from core.geometry import allTiles, lineRuns
 
 
 class Suggestions:
@@ -15,19 +16,16 @@ def find_suggestions(self, stones, colour):
         """
         suggestions = {}
 
-        for x in range(self.cfg.board.size):
-            for y in range(self.cfg.board.size):
-                tile = (x, y)
+        for tile in allTiles(self.cfg.board.size):
+            if tile in stones.map:
+                continue
 
-                if tile in stones.map:
-                    continue
+            row_length = self._calculate_row_length_at_position(stones, tile, colour)
 
-                row_length = self._calculate_row_length_at_position(stones, tile, colour)
-
-                if row_length >= 2:
-                    if row_length not in suggestions:
-                        suggestions[row_length] = []
-                    suggestions[row_length].append(tile)
+            if row_length >= 2:
+                if row_length not in suggestions:
+                    suggestions[row_length] = []
+                suggestions[row_length].append(tile)
 
         return suggestions
 
@@ -35,40 +33,7 @@ def _calculate_row_length_at_position(self, stones, tile, colour):
         """
         Calculate the maximum row length that would be created by placing a stone at the given position.
         """
-        directions = [
-            (0, 1),
-            (1, 0),
-            (1, 1),
-            (1, -1),
-        ]
-
-        x, y = tile
-        max_count = 0
-
-        for dx, dy in directions:
-            count = 1
-
-            nx, ny = x + dx, y + dy
-            while 0 <= nx < self.cfg.board.size and 0 <= ny < self.cfg.board.size:
-                if stones.map.get((nx, ny)) == colour:
-                    count += 1
-                    nx += dx
-                    ny += dy
-                else:
-                    break
-
-            nx, ny = x - dx, y - dy
-            while 0 <= nx < self.cfg.board.size and 0 <= ny < self.cfg.board.size:
-                if stones.map.get((nx, ny)) == colour:
-                    count += 1
-                    nx -= dx
-                    ny -= dy
-                else:
-                    break
-
-            max_count = max(max_count, count)
-
-        return max_count
+        return max(lineRuns(stones, tile, colour))
 
     def get_best_suggestions(self, stones, colour, max_per_length=5):
         """
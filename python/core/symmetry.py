@@ -0,0 +1,62 @@
+from functools import lru_cache
+from core.zobrist import tileKey
+
+
+# The 8 symmetries of the square board (4 rotations, each optionally mirrored).
+# A position's canonical hash is the smallest of its 8 transformed hashes, so
+# mirrored and rotated positions share one key; the transform that gave it maps
+# tiles between the actual and the canonical orientation.
+
+TRANSFORMS = [
+	lambda x, y, n: (x, y),
+	lambda x, y, n: (n - 1 - y, x),
+	lambda x, y, n: (n - 1 - x, n - 1 - y),
+	lambda x, y, n: (y, n - 1 - x),
+	lambda x, y, n: (n - 1 - x, y),
+	lambda x, y, n: (x, n - 1 - y),
+	lambda x, y, n: (y, x),
+	lambda x, y, n: (n - 1 - y, n - 1 - x),
+]
+
+# the quarter turns undo each other, every other transform is its own inverse
+INVERSE = (0, 3, 2, 1, 4, 5, 6, 7)
+
+
+@lru_cache(maxsize=None)
+def tileMaps(size) -> tuple[dict, ...]:
+	"""For each transform, a dict from every tile to its image"""
+	tiles = [(x, y) for x in range(size) for y in range(size)]
+	return tuple({(x, y): f(x, y, size) for x, y in tiles} for f in TRANSFORMS)
+
+
+def transformTile(tile, transform, size):
+	"""actual orientation -> the orientation given by transform"""
+	return tileMaps(size)[transform][tile]
+
+
+def untransformTile(tile, transform, size):
+	"""back from the transformed orientation to the actual one"""
+	return tileMaps(size)[INVERSE[transform]][tile]
+
+
+@lru_cache(maxsize=None)
+def symmetricKeys(tile, colour, size) -> tuple[int, ...]:
+	"""Zobrist key of colour on the image of tile under each transform"""
+	return tuple(tileKey(m[tile], colour) for m in tileMaps(size))
+
+
+def canonicalHash(stones) -> tuple[int, int]:
+	"""
+	(hash, transform): the smallest hash over the 8 orientations of the board,
+	capture counts included. Stones keeps the 8 board hashes up to date
+	"""
+	hashes = stones.symHashes
+	transform = hashes.index(min(hashes))
+	# whatever the stones hash holds besides the stones (capture counts) is symmetric
+	return hashes[transform] ^ stones.hash ^ hashes[0], transform
+
+
+def selfSymmetries(stones) -> list[int]:
+	"""The transforms (besides the identity) that map the position onto itself"""
+	hashes = stones.symHashes
+	return [t for t in range(1, 8) if hashes[t] == hashes[0]]
@@ -0,0 +1,56 @@
+from dataclasses import dataclass
+
+
+EXACT = 0
+LOWER = 1
+UPPER = 2
+
+
+@dataclass(slots=True)
+class TTEntry:
+	key: int
+	depth: int
+	flag: int
+	score: float
+	tile: tuple[int, int] | None
+	generation: int
+
+
+class TranspositionTable:
+	"""
+	Fixed-capacity table of search results keyed by Zobrist hash.
+	Each key owns one slot (key % size); a colliding store only replaces the
+	slot if it is at least as deep or the old entry is from a previous search.
+	"""
+	def __init__(self, size):
+		self.size = max(1, size)
+		self.entries = {}
+		self.generation = 0
+
+
+	def newSearch(self):
+		self.generation += 1
+
+
+	def clear(self):
+		self.entries.clear()
+		self.generation = 0
+
+
+	def probe(self, key) -> TTEntry | None:
+		entry = self.entries.get(key % self.size)
+		if entry is not None and entry.key == key:
+			return entry
+		return None
+
+
+	def store(self, key, depth, flag, score, tile):
+		slot = key % self.size
+		entry = self.entries.get(slot)
+		if (entry is None or depth >= entry.depth
+				or entry.generation != self.generation):
+			self.entries[slot] = TTEntry(key, depth, flag, score, tile, self.generation)
+
+
+	def __len__(self):
+		return len(self.entries)
@@ -32,5 +32,5 @@ def coord_to_nearest_tile(coord: tuple[int, int], board: BoardConfig):
 
 def getOpposingColour(cfg, colour):
 	return (
-		cfg.game.player1Colour if colour == cfg.game.player2Colour else cfg.game.player1Colour
+		cfg.game.player1Colour if colour == cfg.game.player2Colour else cfg.game.player2Colour
 	)
\ No newline at end of file
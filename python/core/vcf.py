@@ -0,0 +1,195 @@
+from config import Config
+from core.move import Move
+from core.geometry import lines, neighbours, segments
+
+
+class _NodeLimit(Exception):
+	pass
+
+
+class VCF:
+	"""
+	Victory by continuous fours: a threat-space search that only plays moves
+	making a four, so the defender's reply is forced (block the fifth tile).
+	A line that ends in a double four / open four is a proven win.
+
+	Refutations are treated conservatively: if the defender's block makes a
+	four of their own, or (in capture variants) a capture breaks the four,
+	the line is not considered forced.
+	"""
+	def __init__(self, cfg, rules):
+		self.cfg = cfg
+		self.rules = rules
+		self.nodes = 0
+
+
+	def forcedMove(self, stones, colour, opponent) -> tuple[int, tuple[int, int]] | None:
+		"""
+		Tactical shortcut before the main search, returns (score, tile) or None:
+			- a move that wins immediately
+			- a block of the opponent's immediate win
+			- the first move of a VCF
+		Only moves the rules allow are returned: with no legal block the
+		search is left to find the best reply
+		"""
+		own = [t for t in self._winningTiles(stones, colour) if self.rules.validateMove(stones, Move(t, colour))[0]]
+		if own:
+			return (float('inf'), own[0])
+
+		threats = self._winningTiles(stones, opponent)
+		blocks = [t for t in threats if self.rules.validateMove(stones, Move(t, colour))[0]]
+		if blocks:
+			return (0, blocks[0])
+		if threats:
+			return None
+
+		line = self.solve(stones, colour, opponent)
+		if line:
+			return (float('inf'), line[0])
+		return None
+
+
+	def solve(self, stones, colour, opponent, max_depth=None) -> list[tuple[int, int]] | None:
+		"""Return colour's moves of a forced win by continuous fours, or None"""
+		if max_depth is None:
+			max_depth = self.cfg.game.aiVcfDepth
+		if max_depth <= 0:
+			return None
+
+		self.nodes = 0
+		self.refuted = {}
+		if self._winningTiles(stones, opponent):
+			return None
+
+		board = stones.copy()
+		try:
+			return self._attack(board, colour, opponent, max_depth)
+		except _NodeLimit:
+			return None
+
+
+	def _attack(self, stones, colour, opponent, depth):
+		if depth == 0 or self.refuted.get(stones.hash, 0) >= depth:
+			return None
+		self.nodes += 1
+		if self.nodes > self.cfg.game.aiVcfNodes:
+			raise _NodeLimit()
+
+		for tile in self._fourCandidates(stones, colour):
+			move = Move(tile, colour)
+			if not self.rules.validateMove(stones, move)[0]:
+				continue
+			self._make(stones, move)
+			try:
+				fives = self._fiveTilesThrough(stones, tile, colour)
+				if not fives or self._canBreak(stones, fives, colour, opponent):
+					continue
+				if len(fives) >= 2:
+					return [tile]
+
+				block = Move(fives[0], opponent)
+				self._make(stones, block)
+				try:
+					if self._fiveTilesThrough(stones, block.tile, opponent):
+						continue
+					line = self._attack(stones, colour, opponent, depth - 1)
+					if line:
+						return [tile] + line
+				finally:
+					stones.unmake()
+			finally:
+				stones.unmake()
+
+		self.refuted[stones.hash] = depth
+		return None
+
+
+	def _make(self, stones, move):
+		stones.make(move, self.rules.previewCaptures(stones, move))
+
+
+	def _winningTiles(self, stones, colour):
+		"""Empty tiles completing five for colour, checked against the variant's win rule"""
+		tiles = self.rules.check_four_in_a_row(stones, colour)
+		return sorted(t for t in tiles if self.rules.checkWin(stones, Move(t, colour)))
+
+
+	def _fiveTilesThrough(self, stones, tile, colour):
+		"""
+		Empty tiles that complete five for colour on the lines through tile:
+		any 5-window containing tile with four own stones and one empty tile
+		"""
+		result = set()
+
+		for cells in lines(self.cfg.board.size, 4)[tile]:
+			line = [(t, stones.map.get(t)) for t in cells]
+
+			for start in range(5):
+				own = 0
+				empty = None
+				for t, c in line[start:start + 5]:
+					if c == colour:
+						own += 1
+					elif t is not None and c is None and empty is None:
+						empty = t
+					else:
+						break
+				else:
+					if own == 4 and self.rules.checkWin(stones, Move(empty, colour)):
+						result.add(empty)
+
+		return sorted(result)
+
+
+	def _fourCandidates(self, stones, colour):
+		"""Empty tiles with at least three own stones within four steps along their lines"""
+		reach = segments(self.cfg.board.size, 4)
+		counts = {}
+
+		for tile, c in stones.map.items():
+			if c != colour:
+				continue
+			for segment in reach[tile]:
+				for _, t in segment:
+					if t not in stones.map:
+						counts[t] = counts.get(t, 0) + 1
+
+		return sorted((t for t, n in counts.items() if n >= 3), key=lambda t: -counts[t])
+
+
+	def _canBreak(self, stones, fives, colour, opponent):
+		"""
+		In capture variants, can opponent answer the four with a capture elsewhere
+		that removes a stone of the four or reaches captureWinCount?
+		A capture on the blocking tile itself is just the forced block.
+		"""
+		if self.cfg.game.difficulty not in ["ninuki", "pente"]:
+			return False
+
+		around = neighbours(self.cfg.board.size, 1)
+		opponent_captures = stones.captures.get(opponent, 0)
+		tried = set(fives) if len(fives) == 1 else set()
+		for stone, c in list(stones.map.items()):
+			if c != colour:
+				continue
+			# a capturing stone always lands next to one of the captured stones
+			for tile in around[stone]:
+				if tile in tried or tile in stones.map:
+					continue
+				tried.add(tile)
+
+				move = Move(tile, opponent)
+				captures = self.rules.previewCaptures(stones, move)
+				if not captures:
+					continue
+				if opponent_captures + len(captures) >= self.cfg.game.captureWinCount:
+					return True
+				stones.make(move, captures)
+				still_wins = any(
+					f not in stones.map and self.rules.checkWin(stones, Move(f, colour))
+					for f in fives
+				)
+				stones.unmake()
+				if not still_wins:
+					return True
+		return False
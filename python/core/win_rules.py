@@ -1,5 +1,6 @@
 from config import Config
 from core.move import Move
+from core.geometry import allTiles, rays, lineRuns
 
 
 class WinRules:
@@ -56,21 +57,9 @@ def canOpponentBreakLine(self, stones, winning_tiles, opponent_colour):
         if not winning_tiles or len(winning_tiles) < 2:
             return False
 
-        if self.move_rules is None:
-            return False
-
-        for x in range(self.cfg.board.size):
-            for y in range(self.cfg.board.size):
-                tile = (x, y)
-                if tile in stones.map:
-                    continue
-
-                test_move = Move(tile, opponent_colour)
-                captures = self.move_rules._calculateCaptures(stones, test_move)
-
-                for capture in captures:
-                    if capture.tile in winning_tiles:
-                        return True
+        for captured in stones.threats.captures(opponent_colour).values():
+            if any(tile in winning_tiles for tile in captured):
+                return True
 
         return False
 
@@ -80,73 +69,53 @@ def wouldOpponentWinByCapture(self, stones, winning_tiles, opponent_colour, oppo
         if self.cfg.game.difficulty not in ["ninuki", "pente"]:
             return False
 
-        if opponent_captures < 8:
+        if opponent_captures < self.cfg.game.captureWinCount - 2:
             return False
 
         if not winning_tiles or len(winning_tiles) < 2:
             return False
 
-        if self.move_rules is None:
-            return False
-
-        for x in range(self.cfg.board.size):
-            for y in range(self.cfg.board.size):
-                tile = (x, y)
-                if tile in stones.map:
-                    continue
-
-                test_move = Move(tile, opponent_colour)
-                captures = self.move_rules._calculateCaptures(stones, test_move)
-
-                captures_from_line = 0
-                for capture in captures:
-                    if capture.tile in winning_tiles:
-                        captures_from_line += 1
-
-                if captures_from_line > 0 and opponent_captures + captures_from_line >= 10:
-                    return True
+        for captured in stones.threats.captures(opponent_colour).values():
+            captures_from_line = sum(1 for tile in captured if tile in winning_tiles)
+            if captures_from_line > 0 and opponent_captures + captures_from_line >= self.cfg.game.captureWinCount:
+                return True
 
         return False
 
 
     def evaluate(self, stones, ai_colour, move):
-        if move == None:
+        if move is None:
             return 0
-        if self.checkWin(stones, move):
+        if self.checkWin(stones, move) or self.checkCaptureWin(stones, move):
             return float('inf') if move.colour == ai_colour else -float('inf')
 
-        scores = {
-            1: 1,
-            2: 10,
-            3: 100,
-            4: 1000,
-        }
-
-        cache = {}
-        def get_row_length_cached(move):
-            key = (move.tile, move.colour)
-            if key not in cache:
-                cache[key] = self._getRowLength(stones, move)
-            return cache[key]
-
-        max_ai = 0
-        max_opp = 0
-        for tile, colour in stones.map.items():
-            temp_move = Move(tile, colour)
-            length = get_row_length_cached(temp_move)
-            score = scores.get(length, 10 ** (length - 1))
-            # length = self._getRowLength(stones, temp_move)
-            if colour == ai_colour:
-                max_ai = max(max_ai, score)
-            else:
-                if length >= 4:
-                    return -1e9
-                if length == 3:
-                    return -1e6
-                max_opp = max(max_opp, score)
+        # live five-windows are counted by Stones as stones come and go
+        windows = stones.windows
+        ai = windows.side(ai_colour)
+        opp = 1 - ai
+        if windows.count(opp, 4):
+            return -1e9
+        # a three with room for an open four lies in at least two live windows
+        if windows.count(opp, 3) >= 2:
+            return -1e6
+
+        return windows.score(ai) - windows.score(opp) * 2 + self._captureScore(stones, ai_colour)
+
+
+    def checkCaptureWin(self, stones, move):
+        """Ninuki-renju and Pente: move's player has captured enough stones to win"""
+        if self.cfg.game.difficulty not in ["ninuki", "pente"]:
+            return False
+        return stones.captures.get(move.colour, 0) >= self.cfg.game.captureWinCount
+
 
-        print(max_ai, max_opp)
-        return max_ai - max_opp * 2
+    def _captureScore(self, stones, ai_colour):
+        """Captured pairs for the ai minus captured pairs for the opponent, each worth a three"""
+        if not stones.captures:
+            return 0
+        ai_captures = stones.captures.get(ai_colour, 0)
+        opponent_captures = sum(stones.captures.values()) - ai_captures
+        return (ai_captures - opponent_captures) // 2 * 100
 
 
     def _checkWinNoOverline(self, stones, move):
@@ -155,35 +124,15 @@ def _checkWinNoOverline(self, stones, move):
 
     def _getWinningTilesForMove(self, stones, move, exactly=None):
         """Get all tiles that form the winning line. If exactly is set, only return lines of that exact length."""
-        directions = [
-            (0, 1),
-            (1, 0),
-            (1, 1),
-            (1, -1),
-        ]
+        tile_rays = rays(self.cfg.board.size)[move.tile]
 
-        x, y = move.tile
-
-        for dx, dy in directions:
+        for d in range(4):
             tiles_in_line = [move.tile]
-
-            nx, ny = x + dx, y + dy
-            while 0 <= nx < self.cfg.board.size and 0 <= ny < self.cfg.board.size:
-                if stones.map.get((nx, ny)) == move.colour:
-                    tiles_in_line.append((nx, ny))
-                    nx += dx
-                    ny += dy
-                else:
-                    break
-
-            nx, ny = x - dx, y - dy
-            while 0 <= nx < self.cfg.board.size and 0 <= ny < self.cfg.board.size:
-                if stones.map.get((nx, ny)) == move.colour:
-                    tiles_in_line.append((nx, ny))
-                    nx -= dx
-                    ny -= dy
-                else:
-                    break
+            for ray in (tile_rays[d], tile_rays[d + 4]):
+                for tile in ray:
+                    if stones.map.get(tile) != move.colour:
+                        break
+                    tiles_in_line.append(tile)
 
             if exactly is not None:
                 if len(tiles_in_line) == exactly:
@@ -194,78 +143,17 @@ def _getWinningTilesForMove(self, stones, move, exactly=None):
 
         return None
 
-    # TODO: cache this
     def _getRowLength(self, stones, move):
-        directions = [
-            (0, 1),
-            (1, 0),
-            (1, 1),
-            (1, -1),
-        ]
-
-        x, y = move.tile
-        max_count = 0
-
-        for dx, dy in directions:
-            count = 1
-
-            nx, ny = x + dx, y + dy
-            while 0 <= nx < self.cfg.board.size and 0 <= ny < self.cfg.board.size:
-                if stones.map.get((nx, ny)) == move.colour:
-                    count += 1
-                    nx += dx
-                    ny += dy
-                else:
-                    break
-
-            nx, ny = x - dx, y - dy
-            while 0 <= nx < self.cfg.board.size and 0 <= ny < self.cfg.board.size:
-                if stones.map.get((nx, ny)) == move.colour:
-                    count += 1
-                    nx -= dx
-                    ny -= dy
-                else:
-                    break
-
-            max_count = max(max_count, count)
-
-        return max_count
+        if stones.bits is not None:
+            return max(stones.bits.runs(move.tile, move.colour))
+        return max(lineRuns(stones, move.tile, move.colour))
 
 
     def check_four_in_a_row(self, stones, colour):
         """
         Find all empty positions where placing a stone would create 5 or more in a row (winning moves).
         """
-        winning_moves = set()
-        directions = [(0, 1), (1, 0), (1, 1), (1, -1)]  # horizontal, vertical, diagonal, anti-diagonal
-
-        for x in range(self.cfg.board.size):
-            for y in range(self.cfg.board.size):
-                if (x, y) in stones.map:
-                    continue
-
-                for dx, dy in directions:
-                    count = 1
-
-                    nx, ny = x + dx, y + dy
-                    while 0 <= nx < self.cfg.board.size and 0 <= ny < self.cfg.board.size:
-                        if stones.map.get((nx, ny)) == colour:
-                            count += 1
-                            nx += dx
-                            ny += dy
-                        else:
-                            break
-
-                    nx, ny = x - dx, y - dy
-                    while 0 <= nx < self.cfg.board.size and 0 <= ny < self.cfg.board.size:
-                        if stones.map.get((nx, ny)) == colour:
-                            count += 1
-                            nx -= dx
-                            ny -= dy
-                        else:
-                            break
-
-                    if count >= 5:
-                        winning_moves.add((x, y))
-
-        return list(winning_moves)
+        return [
+            tile for tile in allTiles(self.cfg.board.size)
+            if tile not in stones.map and self._getRowLength(stones, Move(tile, colour)) >= 5
+        ]
@@ -0,0 +1,125 @@
+from functools import lru_cache
+from core.geometry import DIRECTIONS
+
+
+# Every line of five tiles on the board is a window; a window holding stones of
+# one colour only is a live window for that colour (it can still become five).
+# Weight of a live window by the number of stones in it:
+WEIGHTS = (0, 1, 10, 100, 1000, 10000)
+
+# a window's state packs both stone counts: first side + BASE * second side
+BASE = 6
+
+
+@lru_cache(maxsize=None)
+def windows(size) -> tuple[tuple[tuple[int, int], ...], ...]:
+	"""every line of five tiles on the board"""
+	result = []
+	for x in range(size):
+		for y in range(size):
+			for dx, dy in DIRECTIONS:
+				end = (x + 4 * dx, y + 4 * dy)
+				if 0 <= end[0] < size and 0 <= end[1] < size:
+					result.append(tuple((x + i * dx, y + i * dy) for i in range(5)))
+	return tuple(result)
+
+
+@lru_cache(maxsize=None)
+def windowsThrough(size) -> dict[tuple[int, int], tuple[int, ...]]:
+	"""tile -> indices of the (at most 20) windows containing it"""
+	result = {(x, y): [] for x in range(size) for y in range(size)}
+	for i, window in enumerate(windows(size)):
+		for tile in window:
+			result[tile].append(i)
+	return {tile: tuple(indices) for tile, indices in result.items()}
+
+
+class FiveWindows:
+	"""
+	Stone counts of both colours in every window, with the number of live
+	windows per colour and stone count and their summed WEIGHTS kept up to
+	date. A stone coming or going touches only the windows through its tile,
+	so reading a colour's threats is free.
+	Colours are given a side (0 or 1) in the order they are first seen.
+	"""
+	def __init__(self, size):
+		self.size = size
+		self.through = windowsThrough(size)
+		self.state = [0] * len(windows(size))
+		self.empty = len(self.state)
+		self.sides = {}
+		self.lines = ([0] * 6, [0] * 6)
+		self.scores = [0, 0]
+
+
+	def copy(self):
+		new = FiveWindows.__new__(FiveWindows)
+		new.size = self.size
+		new.through = self.through
+		new.state = self.state.copy()
+		new.empty = self.empty
+		new.sides = self.sides.copy()
+		new.lines = (self.lines[0].copy(), self.lines[1].copy())
+		new.scores = self.scores.copy()
+		return new
+
+
+	def side(self, colour) -> int:
+		side = self.sides.get(colour)
+		if side is None:
+			side = self.sides[colour] = len(self.sides)
+		return side
+
+
+	def add(self, tile, colour):
+		self._update(tile, 1 if self.side(colour) == 0 else BASE)
+
+
+	def remove(self, tile, colour):
+		self._update(tile, -1 if self.side(colour) == 0 else -BASE)
+
+
+	def score(self, side) -> int:
+		"""summed weights of side's live windows"""
+		return self.scores[side]
+
+
+	def count(self, side, stones) -> int:
+		"""number of side's live windows holding exactly stones of its stones"""
+		return self.lines[side][stones]
+
+
+	def open(self, side) -> bool:
+		"""is there a window without any of the other side's stones?"""
+		return self.empty > 0 or any(self.lines[side][1:])
+
+
+	def _update(self, tile, step):
+		state, lines, scores = self.state, self.lines, self.scores
+		first, second = lines
+		for w in self.through[tile]:
+			old = state[w]
+			new = old + step
+			state[w] = new
+
+			a, b = old % BASE, old // BASE
+			if not b:
+				if a:
+					first[a] -= 1
+					scores[0] -= WEIGHTS[a]
+				else:
+					self.empty -= 1
+			elif not a:
+				second[b] -= 1
+				scores[1] -= WEIGHTS[b]
+
+			a, b = new % BASE, new // BASE
+			if not b:
+				if a:
+					first[a] += 1
+					scores[0] += WEIGHTS[a]
+				else:
+					self.empty += 1
+			elif not a:
+				second[b] += 1
+				scores[1] += WEIGHTS[b]
@@ -0,0 +1,25 @@
+import random
+from functools import lru_cache
+
+
+# Zobrist keys: every (tile, colour) pair maps to a fixed random 64-bit number,
+# so a position hash is the XOR of the keys of its stones and can be updated
+# incrementally on place/remove. Keys are derived from a string seed so they are
+# identical across runs and processes.
+
+
+@lru_cache(maxsize=None)
+def tileKey(tile, colour) -> int:
+	return random.Random(f"tile:{tile}:{colour}").getrandbits(64)
+
+
+@lru_cache(maxsize=None)
+def sideKey(colour) -> int:
+	return random.Random(f"side:{colour}").getrandbits(64)
+
+
+@lru_cache(maxsize=None)
+def captureKey(colour, count) -> int:
+	if count == 0:
+		return 0
+	return random.Random(f"captures:{colour}:{count}").getrandbits(64)
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+import os
+os.environ["PYGAME_HIDE_SUPPORT_PROMPT"] = "1"
+import argparse
+import contextlib
+import io
+import time
+from config import Config
+from core.rules import Rules
+from player.player import Player
+from ui.stones import Stones
+from bench import parse_overrides
+
+
+# Engine against engine: plays games between two aiType/settings pairs,
+# swapping colours every game, to compare strength at a given time budget.
+
+
+def make_player(size, difficulty, colour, name, overrides):
+    cfg = Config()
+    cfg.board.size = size
+    cfg.game.difficulty = difficulty
+    cfg.game.noDoubleThrees = False
+    for key, value in overrides.items():
+        setattr(cfg.game, key, value)
+    rules = Rules(cfg)
+    return cfg, rules, Player.make(cfg, rules, cfg.game.aiName, colour, name)
+
+
+def play(size, difficulty, first, second, max_moves):
+    """Returns the winning player's name, or None for a draw, and the seconds each side used"""
+    cfg, rules, p1 = make_player(size, difficulty, Config().game.player1Colour, first[0], first[1])
+    _, _, p2 = make_player(size, difficulty, cfg.game.player2Colour, second[0], second[1])
+    stones = Stones(cfg)
+    used = {p1.name: 0.0, p2.name: 0.0}
+    current, last_move = p1, None
+
+    for _ in range(max_moves):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            move = current.doAction(stones, [], last_move)
+        used[current.name] += time.perf_counter() - start
+        if move is None or not rules.validateMove(stones, move)[0]:
+            return (p2 if current is p1 else p1).name, used
+
+        stones.place(move)
+        captures = rules.getCaptures(stones, move)
+        if captures:
+            stones.remove(captures)
+            stones.addCaptures(move.colour, len(captures))
+            current.captures += len(captures)
+        if rules.checkWin(stones, move) or current.captures >= cfg.game.captureWinCount:
+            return current.name, used
+        if stones.isFull():
+            return None, used
+        current, last_move = (p2 if current is p1 else p1), move
+    return None, used
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Engine match, e.g. --a aiType=minmax --b aiType=mcts")
+    parser.add_argument("--size", type=int, default=15)
+    parser.add_argument("--rules", default="standard")
+    parser.add_argument("--games", type=int, default=4)
+    parser.add_argument("--moves", type=int, default=120, help="moves before a game is called a draw")
+    parser.add_argument("--a", nargs="*", default=[], metavar="KEY=VALUE", help="settings of engine A")
+    parser.add_argument("--b", nargs="*", default=[], metavar="KEY=VALUE", help="settings of engine B")
+    args = parser.parse_args()
+    engines = [("A", parse_overrides(args.a)), ("B", parse_overrides(args.b))]
+
+    score = {"A": 0.0, "B": 0.0}
+    seconds = {"A": 0.0, "B": 0.0}
+    for game in range(args.games):
+        first, second = engines if game % 2 == 0 else engines[::-1]
+        winner, used = play(args.size, args.rules, first, second, args.moves)
+        for name in score:
+            score[name] += 1.0 if winner == name else 0.5 if winner is None else 0.0
+            seconds[name] += used[name]
+        print(f"game {game + 1}: {first[0]} black, winner {winner or 'draw'}")
+
+    for name, settings in engines:
+        print(f"{name} {settings}: score {score[name]}/{args.games} cpu {seconds[name]:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
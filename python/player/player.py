@@ -4,6 +4,11 @@
 from core.utils import *
 from core.move import Move
 from core.minmax import Minimax
+from core.mcts import MCTS
+from core.vcf import VCF
+from core.ponder import Ponderer
+from core.book import OpeningBook
+from core.pns import ProofNumberSolver, SolvedStore, storePath, WIN, LOSS
 from config import Config
 from abc import ABC, abstractmethod
 
@@ -30,6 +35,8 @@ def make(cls, cfg, rules, playerType, colour, name):
         elif playerType == cfg.game.aiName:
             if cfg.game.aiType == 'random':
                 return RandomAI(cfg, rules, colour, name)
+            elif cfg.game.aiType == 'mcts':
+                return MCTSAI(cfg, rules, colour, name)
             else:
                 return AI(cfg, rules, colour, name)
         else:
@@ -52,11 +59,19 @@ def doAction(self, stones, events, _) -> Move | None:
 class AI(Player):
 	def __init__(self, cfg, rules, colour, name):
 		super().__init__(cfg, rules, colour, name)
-		self.minimax = Minimax(cfg, rules, colour, getOpposingColour(cfg, colour))
+		self.opponent_colour = getOpposingColour(cfg, colour)
+		self.minimax = Minimax(cfg, rules, colour, self.opponent_colour)
+		self.vcf = VCF(cfg, rules)
+		self.ponderer = Ponderer(cfg, rules, self.minimax)
+		self.book = OpeningBook.open(cfg)
+		self.solver = None
+		if cfg.board.size <= cfg.game.aiSolveMaxSize:
+			store = SolvedStore(storePath(cfg.game.difficulty, cfg.board.size))
+			self.solver = ProofNumberSolver(cfg, rules, store)
 
 	def doAction(self, stones, _, last_move) -> Move | None:
 		try:
-			score, tile = self.minimax.choose_move(stones, last_move, 5)
+			score, tile = self._think(stones, last_move)
 			if tile == None:
 				return None
 			move = Move(tile, self.colour)
@@ -89,6 +104,80 @@ def doAction(self, stones, _, last_move) -> Move | None:
 				tile = random.choice(empty_tiles)
 				return Move(tile, self.colour)
 			return None
+		finally:
+			self.minimax.cancel.clear()
+
+	def startPondering(self, stones):
+		"""Called once the AI's move is on the board and the opponent is thinking"""
+		if self.cfg.game.aiPonder:
+			self.ponderer.start(stones)
+
+	def stopPondering(self):
+		self.ponderer.stop()
+
+	def cancelSearch(self):
+		"""Ask a running doAction (on another thread) to stop and play its best move so far"""
+		self.minimax.cancel.set()
+
+	def _log(self, message):
+		if self.cfg.game.aiVerbose:
+			print(message)
+
+	def _think(self, stones, last_move) -> tuple[int, tuple[int, int]]:
+		"""
+		Book move or proven result on small boards, else tactics, then the
+		pondered answer if the opponent played a predicted move, else the full search
+		"""
+		self.ponderer.stop()
+		if self.cfg.game.aiBook:
+			booked = self.book.lookup(stones, self.colour)
+			if booked is not None and self.rules.validateMove(stones, Move(booked[1], self.colour))[0]:
+				self._log("book move")
+				return booked
+
+		empty = self.cfg.board.size ** 2 - len(stones.map)
+		if self.solver is not None and empty <= self.cfg.game.aiSolveMaxEmpty:
+			solved = self.solver.solve(stones, self.colour, self.opponent_colour, cancel=self.minimax.cancel)
+			# a lost position is left to the search, which picks the most stubborn defence
+			if solved is not None and solved[0] != LOSS and solved[1] is not None:
+				self._log(f"solved: {'win' if solved[0] == WIN else 'draw'} ({self.solver.nodes} nodes)")
+				return (float('inf') if solved[0] == WIN else 0, solved[1])
+
+		forced = self.vcf.forcedMove(stones, self.colour, self.opponent_colour)
+		if forced is not None:
+			self._log(f"vcf: {self.vcf.nodes} nodes")
+			return forced
+
+		# the ponderer only ran the search, so it stands in for that alone
+		pondered = self.ponderer.lookup(stones)
+		if pondered is not None:
+			self._log("ponder hit")
+			return pondered
+
+		return self._search(stones, last_move)
+
+	def _search(self, stones, last_move) -> tuple[int, tuple[int, int]]:
+		result = self.minimax.search(stones, last_move)
+		self._log(self.minimax.report())
+		return result
+
+
+class MCTSAI(AI):
+	"""Same book, solver and tactics as AI, with Monte Carlo tree search as the main search"""
+	def __init__(self, cfg, rules, colour, name):
+		super().__init__(cfg, rules, colour, name)
+		self.mcts = MCTS(cfg, rules, colour, self.opponent_colour)
+		# cancelSearch() and doAction() already handle the minimax event
+		self.mcts.cancel = self.minimax.cancel
+
+	def startPondering(self, stones):
+		"""The tree is reused on the next move instead"""
+		pass
+
+	def _search(self, stones, last_move) -> tuple[float, tuple[int, int]]:
+		result = self.mcts.search(stones, last_move)
+		self._log(self.mcts.report())
+		return result
 
 
 class RandomAI(Player):
@@ -0,0 +1,20 @@
+import pytest
+from config import Config
+
+
+@pytest.fixture
+def make_cfg():
+	"""
+	Config factory for the tests: Config() leaves the rule variant and the
+	double-three rule to the menu, so they are set here, along with any other
+	game settings given by name
+	"""
+	def make(size=19, difficulty="standard", no_double_threes=False, **game):
+		cfg = Config()
+		cfg.board.size = size
+		cfg.game.difficulty = difficulty
+		cfg.game.noDoubleThrees = no_double_threes
+		for key, value in game.items():
+			setattr(cfg.game, key, value)
+		return cfg
+	return make
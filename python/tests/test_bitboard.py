@@ -0,0 +1,41 @@
+import random
+from core.move import Move
+from core.rules import Rules
+from core.beam import Beam
+from core.shapes import shapes
+from ui.stones import Stones
+
+
+def test_bitboard_answers_like_the_dict_board(make_cfg):
+	cfgs = [make_cfg(size=13, difficulty="ninuki", no_double_threes=True, boardBackend=backend) for backend in ["dict", "bitboard"]]
+	rules = [Rules(cfg) for cfg in cfgs]
+	beams = [Beam(cfg) for cfg in cfgs]
+	boards = [Stones(cfg) for cfg in cfgs]
+	black, white = cfgs[0].colour.black, cfgs[0].colour.white
+	assert boards[0].bits is None and boards[1].bits is not None
+
+	rng = random.Random(0)
+	for _ in range(80):
+		tile = (rng.randrange(13), rng.randrange(13))
+		colour = rng.choice([black, white])
+		for stones in boards:
+			if tile in stones.map and colour == black:
+				stones.remove([Move(tile, stones.map[tile])])
+			else:
+				stones.place(Move(tile, colour))
+	boards[1] = boards[1].copy()
+
+	for tile in boards[0].allMoves:
+		for colour in (black, white):
+			move = Move(tile, colour)
+			answers = [
+				(
+					min(r.win_rules._getRowLength(stones, move), 6),
+					r.checkWin(stones, move),
+					sorted(m.tile for m in r.previewCaptures(stones, move)) if tile not in stones.map else None,
+					shapes(stones, tile, colour),
+					beam.runs(stones, tile, colour),
+				)
+				for r, beam, stones in zip(rules, beams, boards)
+			]
+			assert answers[0] == answers[1]
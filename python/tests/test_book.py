@@ -0,0 +1,49 @@
+from config import Config
+from core.book import OpeningBook, makeRecord, writeBook
+from core.move import Move
+from core.symmetry import canonicalHash, transformTile, untransformTile
+from ui.stones import Stones
+
+
+def make_stones(cfg, moves):
+	stones = Stones(cfg)
+	for tile, colour in moves:
+		stones.place(Move(tile, colour))
+	return stones
+
+
+def test_canonical_hash_is_symmetric():
+	cfg = Config()
+	black, white = cfg.colour.black, cfg.colour.white
+	size = cfg.board.size
+	moves = [((9, 9), black), ((10, 11), white), ((3, 4), black)]
+
+	key, _ = canonicalHash(make_stones(cfg, moves))
+	for t in range(8):
+		mirrored = make_stones(cfg, [(transformTile(tile, t, size), c) for tile, c in moves])
+		assert canonicalHash(mirrored)[0] == key
+		assert untransformTile(transformTile((3, 4), t, size), t, size) == (3, 4)
+
+	other = make_stones(cfg, moves[:2] + [((3, 5), black)])
+	assert canonicalHash(other)[0] != key
+
+
+def test_book_lookup_in_mirrored_position(tmp_path):
+	cfg = Config()
+	black, white = cfg.colour.black, cfg.colour.white
+	size = cfg.board.size
+	moves = [((9, 9), black), ((10, 10), white)]
+
+	stones = make_stones(cfg, moves)
+	records = dict([makeRecord(stones, black, (8, 8), 42), makeRecord(Stones(cfg), black, (9, 9), 0)])
+	path = tmp_path / "standard-19.book"
+	writeBook(str(path), records)
+
+	book = OpeningBook(str(path))
+	assert len(book) == 2
+	assert book.lookup(stones, black) == (42, (8, 8))
+	assert book.lookup(stones, white) is None
+
+	# rotated a quarter turn, the answer rotates with it
+	rotated = make_stones(cfg, [(transformTile(tile, 1, size), c) for tile, c in moves])
+	assert book.lookup(rotated, black) == (42, transformTile((8, 8), 1, size))
@@ -0,0 +1,47 @@
+from config import Config
+from core.move import Move
+from core.rules import Rules
+from ui.stones import Stones
+
+
+def test_index_follows_the_board(make_cfg):
+	cfg = make_cfg(difficulty="ninuki")
+	black, white = cfg.colour.black, cfg.colour.white
+	rules = Rules(cfg)
+	stones = Stones(cfg)
+	assert Stones(Config()).threats is None
+
+	for tile, colour in [((5, 5), white), ((6, 5), black), ((7, 5), black)]:
+		stones.place(Move(tile, colour))
+	assert stones.threats.captures(white) == {(8, 5): [(7, 5), (6, 5)]}
+	assert stones.threats.captures(black) == {}
+
+	# blocking the empty end takes the threat away, freeing it brings it back
+	stones.place(Move((8, 5), black))
+	assert stones.threats.captures(white) == {}
+	stones.remove([Move((8, 5), black)])
+
+	copy = stones.copy()
+	move = Move((8, 5), white)
+	stones.make(move, rules.previewCaptures(stones, move))
+	assert stones.threats.captures(white) == {}
+	assert copy.threats.captures(white) == {(8, 5): [(7, 5), (6, 5)]}
+	stones.unmake()
+	assert stones.threats.threats == copy.threats.threats
+
+
+def test_breaking_a_five_by_capture(make_cfg):
+	cfg = make_cfg(difficulty="ninuki")
+	black, white = cfg.colour.black, cfg.colour.white
+	rules = Rules(cfg)
+	stones = Stones(cfg)
+	five = [(x, 5) for x in range(3, 8)]
+	for tile in five:
+		stones.place(Move(tile, black))
+	stones.place(Move((4, 4), black))
+	assert not rules.win_rules.canOpponentBreakLine(stones, five, white)
+
+	stones.place(Move((4, 3), white))
+	assert rules.win_rules.canOpponentBreakLine(stones, five, white)
+	assert not rules.win_rules.wouldOpponentWinByCapture(stones, five, white, 0)
+	assert rules.win_rules.wouldOpponentWinByCapture(stones, five, white, cfg.game.captureWinCount - 1)
@@ -0,0 +1,49 @@
+from config import Config
+from core.move import Move
+from ui.stones import Stones
+
+
+def brute_frontier(stones, radius):
+	size = stones.cfg.board.size
+	result = set()
+	for (x, y) in stones.map:
+		for dx in range(-radius, radius + 1):
+			for dy in range(-radius, radius + 1):
+				tile = (x + dx, y + dy)
+				if 0 <= tile[0] < size and 0 <= tile[1] < size and tile not in stones.map:
+					result.add(tile)
+	return result
+
+
+def test_frontier_follows_make_and_unmake():
+	cfg = Config()
+	black, white = cfg.colour.black, cfg.colour.white
+	stones = Stones(cfg)
+	assert stones.radius == 1 and stones.frontier == set()
+
+	stones.make(Move((0, 0), black))
+	stones.make(Move((1, 1), white))
+	assert stones.frontier == brute_frontier(stones, 1)
+
+	# black captures the white stones on (1, 1) and (2, 2)
+	stones.make(Move((2, 2), white))
+	stones.make(Move((3, 3), black), [Move((1, 1), white), Move((2, 2), white)])
+	assert stones.frontier == brute_frontier(stones, 1)
+	copy = stones.copy()
+
+	stones.unmake()
+	assert stones.frontier == brute_frontier(stones, 1)
+	while stones._undo:
+		stones.unmake()
+	assert stones.frontier == set() and stones.near == {}
+	assert copy.frontier == brute_frontier(copy, 1)
+
+
+def test_frontier_radius_per_board_size():
+	cfg = Config()
+	cfg.board.size = 9
+	stones = Stones(cfg)
+	assert stones.radius == 2
+	stones.place(Move((0, 4), cfg.colour.black))
+	assert stones.frontier == brute_frontier(stones, 2)
+	assert len(stones.frontier) == 14
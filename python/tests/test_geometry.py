@@ -0,0 +1,28 @@
+from config import Config
+from core.geometry import allTiles, neighbours, rays, segments, lineRuns
+from core.move import Move
+from ui.stones import Stones
+
+
+def test_geometry_is_shared_and_on_the_board():
+	cfg = Config()
+	assert Stones(cfg).allMoves is Stones(cfg).allMoves is allTiles(19)
+	assert len(allTiles(19)) == 361
+
+	assert len(neighbours(19, 1)[(0, 0)]) == 3 and len(neighbours(19, 1)[(9, 9)]) == 8
+	corner = rays(19)[(0, 0)]
+	assert [len(ray) for ray in corner] == [18, 18, 18, 0, 0, 0, 0, 0]
+	assert corner[2][:2] == ((1, 1), (2, 2))
+	assert [len(s) for s in segments(19, 4)[(2, 9)]] == [8, 6, 6, 6]
+
+
+def test_line_runs():
+	cfg = Config()
+	black, white = cfg.colour.black, cfg.colour.white
+	stones = Stones(cfg)
+	for tile in [(1, 0), (2, 0), (3, 0), (0, 1), (1, 1)]:
+		stones.place(Move(tile, black))
+	stones.place(Move((4, 0), white))
+	# along DIRECTIONS: (0, 1), (1, 0), (1, 1), (1, -1)
+	assert lineRuns(stones, (0, 0), black) == [2, 4, 2, 1]
+	assert lineRuns(stones, (0, 0), white) == [1, 1, 1, 1]
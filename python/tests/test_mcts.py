@@ -0,0 +1,40 @@
+from core.rules import Rules
+from core.mcts import MCTS
+from core.move import Move
+from ui.stones import Stones
+
+
+def test_mcts_takes_the_win(make_cfg):
+	cfg = make_cfg(size=15)
+	black, white = cfg.colour.black, cfg.colour.white
+	mcts = MCTS(cfg, Rules(cfg), white, black)
+
+	stones = Stones(cfg)
+	for x in range(3, 7):
+		stones.place(Move((x, 5), white))
+	for tile in [(3, 6), (4, 7), (5, 8), (9, 9)]:
+		stones.place(Move(tile, black))
+	stones.place(Move((2, 5), black))
+
+	score, tile = mcts.search(stones, Move((2, 5), black), iterations=200)
+	assert tile == (7, 5)
+	assert score > 0.9
+
+
+def test_mcts_reuses_the_tree(make_cfg):
+	cfg = make_cfg(size=15)
+	black, white = cfg.colour.black, cfg.colour.white
+	mcts = MCTS(cfg, Rules(cfg), white, black)
+
+	stones = Stones(cfg)
+	stones.place(Move((7, 7), black))
+	_, tile = mcts.search(stones, Move((7, 7), black), iterations=300)
+	stones.place(Move(tile, white))
+
+	# answer with black's most explored reply, its subtree becomes the new root
+	child = next(c for c in mcts.root.children if c.tile == tile)
+	reply = max(child.children, key=lambda c: c.visits)
+	stones.place(Move(reply.tile, black))
+	mcts.search(stones, Move(reply.tile, black), iterations=10)
+	assert mcts.root is reply
+	assert reply.visits > 10
@@ -0,0 +1,51 @@
+from core.move_ordering import MoveOrdering
+
+
+BLACK, WHITE = (0, 0, 0), (255, 255, 255)
+
+
+def test_order_hash_killers_counter_history():
+	ordering = MoveOrdering()
+	tiles = [(0, 0), (1, 1), (2, 2), (3, 3), (4, 4), (5, 5)]
+
+	ordering.recordCutoff((5, 5), 2, BLACK, 1, None, 3)
+	ordering.recordCutoff((4, 4), 2, BLACK, 1, None, 2)
+	ordering.recordCutoff((3, 3), 3, BLACK, 2, (9, 9), 1)
+	ordering.recordCutoff((2, 2), 5, BLACK, 4, None, 0)
+
+	# hash move, then the killers of the ply (latest first), then the counter
+	# to (9, 9), then history: (2, 2) earned 4 * 4 at depth 4, the rest 1 or less
+	assert ordering.order(tiles, 2, BLACK, hash_tile=(0, 0), last_tile=(9, 9)) == [
+		(0, 0), (4, 4), (5, 5), (3, 3), (2, 2), (1, 1)
+	]
+	# history and counters are kept per colour, killers per ply
+	assert ordering.order(tiles, 4, WHITE, last_tile=(9, 9)) == tiles
+	assert ordering.cutoffs == 4 and ordering.firstCutoffRate() == 0.25
+
+
+def test_killers_keep_the_two_latest():
+	ordering = MoveOrdering()
+	for tile in [(1, 1), (2, 2), (2, 2), (3, 3)]:
+		ordering.recordCutoff(tile, 0, BLACK, 1, None, 1)
+	assert ordering.killers[0] == [(3, 3), (2, 2)]
+
+
+def test_new_search_ages_history():
+	ordering = MoveOrdering()
+	ordering.recordCutoff((1, 1), 0, BLACK, 3, (9, 9), 0)
+	ordering.recordCutoff((2, 2), 1, BLACK, 1, None, 1)
+
+	ordering.newSearch()
+	assert ordering.killers == {}
+	assert ordering.history[BLACK] == {(1, 1): 4, (2, 2): 0}
+	assert ordering.counters[BLACK] == {(9, 9): (1, 1)}
+	assert ordering.cutoffs == 0 and ordering.firstCutoffRate() == 0.0
+
+	# what is left still orders the next search
+	assert ordering.order([(2, 2), (1, 1)], 0, BLACK) == [(1, 1), (2, 2)]
+
+
+def test_disabled_keeps_the_order():
+	ordering = MoveOrdering(enabled=False)
+	ordering.recordCutoff((1, 1), 0, BLACK, 3, None, 0)
+	assert ordering.order([(0, 0), (1, 1)], 0, BLACK, hash_tile=(1, 1)) == [(0, 0), (1, 1)]
@@ -0,0 +1,82 @@
+from core.rules import Rules
+from core.move import Move
+from core.pns import ProofNumberSolver, SolvedStore, WIN, DRAW, LOSS, _Node
+from ui.stones import Stones
+
+
+def make_position(cfg, moves):
+	stones = Stones(cfg)
+	colours = [cfg.colour.black, cfg.colour.white]
+	for i, tile in enumerate(moves):
+		stones.make(Move(tile, colours[i % 2]))
+	return stones
+
+
+def test_proves_win_and_reads_it_back(make_cfg, tmp_path):
+	# black to play an open four on row 3
+	cfg = make_cfg(size=7)
+	stones = make_position(cfg, [(1, 3), (0, 0), (2, 3), (6, 6), (3, 3), (6, 0)])
+	black, white = cfg.colour.black, cfg.colour.white
+	store = SolvedStore(str(tmp_path / "standard-7.solved"))
+	solver = ProofNumberSolver(cfg, Rules(cfg), store)
+
+	assert solver.solve(stones, black, white, max_nodes=500, time_limit=10) == (WIN, (4, 3))
+	assert len(store) >= 1
+
+	# a new solver on the same file answers without searching, mirrored too
+	mirrored = Stones(cfg)
+	for (x, y), colour in stones.map.items():
+		mirrored.place(Move((x, 6 - y), colour))
+	solver = ProofNumberSolver(cfg, Rules(cfg), SolvedStore(str(tmp_path / "standard-7.solved")))
+	assert solver.solve(mirrored, black, white) == (WIN, (4, 3))
+	assert solver.nodes == 0
+
+
+def test_proves_draw_on_small_board(make_cfg):
+	cfg = make_cfg(size=5)
+	stones = make_position(cfg, [(2, 2), (1, 1), (2, 1), (2, 3), (1, 2), (3, 2),
+	                              (3, 1), (0, 1), (1, 3), (3, 3), (4, 0), (0, 4)])
+	black, white = cfg.colour.black, cfg.colour.white
+	solver = ProofNumberSolver(cfg, Rules(cfg))
+
+	result, tile = solver.solve(stones, black, white, max_nodes=2000, time_limit=10)
+	assert result == DRAW and tile not in stones.map
+
+
+def test_lost_position_picks_the_longest_refutation(make_cfg):
+	# white's open four on row 1, black can only block one end
+	cfg = make_cfg(size=7)
+	stones = make_position(cfg, [(3, 5), (1, 1), (5, 5), (2, 1), (0, 6), (3, 1), (6, 6), (4, 1)])
+	black, white = cfg.colour.black, cfg.colour.white
+	solver = ProofNumberSolver(cfg, Rules(cfg))
+
+	result, tile = solver.solve(stones, black, white, max_nodes=2000, time_limit=10)
+	assert result == LOSS and tile not in stones.map
+
+	# among lost moves the one with the largest proof tree is picked
+	root = _Node(None, None)
+	short, long = _Node((0, 0), root), _Node((1, 1), root)
+	long.children = [_Node((2, 2), long), _Node((3, 3), long)]
+	root.children = [short, long]
+	assert solver._size(long) == 3
+	assert solver._pick(root, lambda c: True, key=lambda c: -solver._size(c)) == (1, 1)
+
+
+def test_five_that_can_be_captured_is_not_won(make_cfg):
+	cfg = make_cfg(size=7, difficulty="ninuki")
+	stones = Stones(cfg)
+	black, white = cfg.colour.black, cfg.colour.white
+	for tile in [(1, 3), (2, 3), (3, 3), (4, 3), (2, 2)]:
+		stones.place(Move(tile, black))
+	stones.place(Move((2, 1), white))
+	solver = ProofNumberSolver(cfg, Rules(cfg))
+
+	# white breaks the five by taking (2, 2) and (2, 3) from (2, 4)
+	move = Move((5, 3), black)
+	stones.make(move)
+	assert solver._leaf(stones, move, white, black) is None
+	stones.unmake()
+
+	stones.remove([Move((2, 1), white)])
+	stones.make(move)
+	assert solver._leaf(stones, move, white, black) is True
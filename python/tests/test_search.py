@@ -0,0 +1,272 @@
+import time
+from core.rules import Rules
+from core.minmax import Minimax
+from core.parallel import encodeBoard, decodeBoard, _makeConfig
+from core.ponder import Ponderer
+from core.move import Move, tileIndex, indexTile, colourCode, codeColour
+from core.zobrist import sideKey
+from player.player import AI
+from ui.stones import Stones
+
+
+def test_search_respects_deadline(make_cfg):
+	cfg = make_cfg()
+	rules = Rules(cfg)
+	black, white = cfg.colour.black, cfg.colour.white
+	minimax = Minimax(cfg, rules, white, black)
+
+	stones = Stones(cfg)
+	for tile, colour in [((9, 9), black), ((10, 10), white), ((9, 10), black), ((8, 8), white), ((9, 11), black)]:
+		stones.place(Move(tile, colour))
+
+	start = time.perf_counter()
+	score, tile = minimax.search(stones, Move((9, 11), black), time_budget=0.3)
+	elapsed = time.perf_counter() - start
+
+	assert tile is not None and tile not in stones.map
+	assert minimax.completed_depth >= 1
+	assert elapsed < 1.5
+
+
+def test_board_encoding_round_trip(make_cfg):
+	cfg = make_cfg(size=9, difficulty="ninuki")
+	black, white = cfg.colour.black, cfg.colour.white
+
+	stones = Stones(cfg)
+	stones.place(Move((4, 4), black))
+	stones.place(Move((5, 4), white))
+	stones.addCaptures(white, 2)
+	last_move = Move((5, 4), white)
+
+	params, board, captures, last = encodeBoard(cfg, stones, last_move)
+	assert len(board) == 81
+
+	decoded, decoded_last = decodeBoard(cfg, board, captures, last)
+	assert decoded.map == stones.map
+	assert decoded.hash == stones.hash
+	assert decoded_last == last_move
+
+	cfg.game.boardBackend = "bitboard"
+	params = encodeBoard(cfg, stones, last_move)[0]
+	assert _makeConfig(params).game.boardBackend == "bitboard"
+
+
+def test_move_encoding(make_cfg):
+	cfg = make_cfg(size=15)
+	move = Move((3, 11), cfg.game.player2Colour)
+	index = tileIndex(move.tile, 15)
+	assert index == 11 * 15 + 3 and indexTile(index, 15) == move.tile
+	assert colourCode(cfg, move.colour) == 2 and codeColour(cfg, 2) == move.colour
+	assert not hasattr(move, "__dict__")
+
+
+def test_parallel_root_matches_serial(make_cfg):
+	cfg = make_cfg(size=9)
+	rules = Rules(cfg)
+	black, white = cfg.colour.black, cfg.colour.white
+
+	stones = Stones(cfg)
+	for tile, colour in [((4, 4), black), ((5, 5), white), ((4, 5), black)]:
+		stones.place(Move(tile, colour))
+	last_move = Move((4, 5), black)
+
+	serial = Minimax(cfg, rules, white, black).search(stones, last_move, time_budget=float('inf'), max_depth=2)
+
+	cfg.game.aiWorkers = 2
+	parallel = Minimax(cfg, rules, white, black).search(stones, last_move, time_budget=float('inf'), max_depth=2)
+	assert parallel == serial
+
+
+def test_ponder_answers_predicted_reply(make_cfg):
+	cfg = make_cfg(size=9)
+	cfg.game.aiTimeBudget = 0.2
+	cfg.game.aiPonderReplies = 1
+	rules = Rules(cfg)
+	black, white = cfg.colour.black, cfg.colour.white
+	minimax = Minimax(cfg, rules, white, black)
+	ponderer = Ponderer(cfg, rules, minimax)
+
+	stones = Stones(cfg)
+	stones.place(Move((4, 4), black))
+	stones.place(Move((5, 5), white))
+
+	predicted = ponderer._predict(stones.copy())[0]
+	ponderer.start(stones)
+	ponderer.thread.join()
+
+	stones.place(Move(predicted, black))
+	hit = ponderer.lookup(stones)
+	assert hit is not None and hit[1] not in stones.map
+
+	# a different reply is not in the cache, and stopping an idle ponderer is harmless
+	stones.remove([Move(predicted, black)])
+	stones.place(Move((0, 0), black))
+	assert ponderer.lookup(stones) is None
+	ponderer.stop()
+
+
+def test_ponder_hit_does_not_skip_tactics(make_cfg):
+	cfg = make_cfg(size=15)
+	cfg.game.aiBook = False
+	rules = Rules(cfg)
+	black, white = cfg.colour.black, cfg.colour.white
+	ai = AI(cfg, rules, white, "AI")
+
+	stones = Stones(cfg)
+	for tile in [(3, 7), (4, 7), (5, 7), (6, 7)]:
+		stones.place(Move(tile, black))
+	stones.place(Move((2, 7), white))
+	# a stale answer for this position must not stand in for the block
+	ai.ponderer.cache[stones.hash ^ sideKey(white)] = (0, (0, 0))
+
+	assert ai._think(stones, Move((6, 7), black))[1] == (7, 7)
+
+
+def test_ponder_stops_cleanly(make_cfg):
+	cfg = make_cfg(size=19)
+	cfg.game.aiTimeBudget = 30
+	rules = Rules(cfg)
+	black, white = cfg.colour.black, cfg.colour.white
+	minimax = Minimax(cfg, rules, white, black)
+	ponderer = Ponderer(cfg, rules, minimax)
+
+	stones = Stones(cfg)
+	stones.place(Move((9, 9), black))
+	stones.place(Move((10, 10), white))
+
+	ponderer.start(stones)
+	time.sleep(0.2)
+	start = time.perf_counter()
+	ponderer.stop()
+	assert time.perf_counter() - start < 1.0
+	assert ponderer.thread is None
+	assert not minimax.cancel.is_set()
+
+
+def test_beam_keeps_forcing_moves(make_cfg):
+	cfg = make_cfg()
+	cfg.game.aiBeamWidths = (3, 1)
+	black, white = cfg.colour.black, cfg.colour.white
+	minimax = Minimax(cfg, Rules(cfg), white, black)
+
+	# two black fours against the edge, both need blocking
+	stones = Stones(cfg)
+	for i in range(4):
+		stones.place(Move((i, 3), black))
+		stones.place(Move((15, 18 - i), black))
+	for tile in [(10, 10), (11, 11), (12, 12)]:
+		stones.place(Move(tile, white))
+
+	tiles = minimax._getPossibleTiles(stones)
+	deep = minimax.beam.select(stones, tiles, 5, white, black)
+	assert sorted(deep) == [(4, 3), (15, 14)]
+
+	root = minimax.beam.select(stones, tiles, 0, white, black)
+	assert len(root) == 3 and root[2] in [(9, 9), (13, 13)]
+
+
+def test_beam_keeps_captures(make_cfg):
+	cfg = make_cfg(difficulty="ninuki", aiBeamWidths=(2,))
+	black, white = cfg.colour.black, cfg.colour.white
+	minimax = Minimax(cfg, Rules(cfg), white, black)
+
+	# white's three outscores everything, but taking the black pair on row 3 stays in
+	stones = Stones(cfg)
+	for tile in [(10, 10), (11, 11), (12, 12), (2, 3)]:
+		stones.place(Move(tile, white))
+	for tile in [(3, 3), (4, 3), (12, 10)]:
+		stones.place(Move(tile, black))
+
+	tiles = minimax._getPossibleTiles(stones)
+	kept = minimax.beam.select(stones, tiles, 0, white, black)
+	assert sorted(kept) == [(5, 3), (9, 9), (13, 13)]
+
+
+def test_quiescence_sees_past_the_horizon(make_cfg):
+	cfg = make_cfg()
+	black, white = cfg.colour.black, cfg.colour.white
+	minimax = Minimax(cfg, Rules(cfg), white, black)
+
+	# white has an open three, black's last move makes a three elsewhere
+	stones = Stones(cfg)
+	for tile in [(5, 5), (6, 5), (7, 5)]:
+		stones.place(Move(tile, white))
+	for tile in [(10, 10), (10, 11)]:
+		stones.place(Move(tile, black))
+	stones.make(Move((8, 5), white))
+	last = Move((10, 12), black)
+	stones.make(last)
+
+	static = minimax.rules.evaluate(stones, white, last)
+	assert static != float('inf')
+	assert minimax._quiesce(stones, last, white, -float('inf'), float('inf'), 4) == float('inf')
+
+	# a copied board has no undo history to read the last capture from
+	assert minimax.choose_move(stones.copy(), last, 0, white)[0] is not None
+
+	cfg.game.aiQuiescenceDepth = 0
+	assert minimax.choose_move(stones, last, 0, white)[0] == static
+
+
+def test_symmetric_root_moves_and_shared_tt(make_cfg):
+	cfg = make_cfg(size=9)
+	black, white = cfg.colour.black, cfg.colour.white
+	minimax = Minimax(cfg, Rules(cfg), white, black)
+
+	stones = Stones(cfg)
+	stones.place(Move((4, 4), black))
+	# a lone centre stone: 24 tiles within radius 2, but only 5 up to symmetry
+	assert len(stones.frontier) == 24
+	assert len(minimax._candidates(stones, 0, white, None, None)) == 5
+
+	stones.place(Move((5, 3), white))
+	stones.place(Move((2, 4), black))
+	score, tile = minimax.search(stones, Move((2, 4), black), time_budget=float('inf'), max_depth=2)
+
+	# the same position mirrored left to right finds the mirrored best move in the table
+	mirrored = Stones(cfg)
+	for (x, y), colour in stones.map.items():
+		mirrored.place(Move((8 - x, y), colour))
+	key, transform = minimax._ttKey(mirrored, white)
+	assert minimax._ttTile(minimax.tt.probe(key), transform) == (8 - tile[0], tile[1])
+
+
+def test_search_wins_by_capture(make_cfg):
+	cfg = make_cfg(difficulty="ninuki")
+	black, white = cfg.colour.black, cfg.colour.white
+	minimax = Minimax(cfg, Rules(cfg), white, black)
+
+	# white X O O _ on row 5 with 8 captures already: taking the pair wins
+	stones = Stones(cfg)
+	stones.place(Move((5, 5), white))
+	stones.place(Move((6, 5), black))
+	stones.place(Move((7, 5), black))
+	stones.place(Move((12, 12), black))
+	stones.addCaptures(white, 8)
+
+	before = stones.hash
+	score, tile = minimax.search(stones, Move((12, 12), black), time_budget=float('inf'), max_depth=2)
+	assert (score, tile) == (float('inf'), (8, 5))
+	assert stones.hash == before and (6, 5) in stones.map
+
+
+def test_reductions_keep_the_block_and_search_less(make_cfg):
+	results = {}
+	for pruning in (True, False):
+		cfg = make_cfg()
+		cfg.game.aiLmr = cfg.game.aiFutility = pruning
+		black, white = cfg.colour.black, cfg.colour.white
+		minimax = Minimax(cfg, Rules(cfg), white, black)
+
+		# black's open three on row 9 has to be blocked at either end
+		stones = Stones(cfg)
+		for tile in [(8, 9), (9, 9), (10, 9), (9, 8)]:
+			stones.place(Move(tile, black))
+		for tile in [(9, 10), (10, 10), (8, 8)]:
+			stones.place(Move(tile, white))
+		score, tile = minimax.search(stones, Move((10, 9), black), time_budget=float('inf'), max_depth=4)
+		results[pruning] = (tile, minimax.nodes)
+
+	assert results[True][0] in [(7, 9), (11, 9)]
+	assert results[False][0] in [(7, 9), (11, 9)]
+	assert results[True][1] < results[False][1]
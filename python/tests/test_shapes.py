@@ -0,0 +1,40 @@
+from core.move import Move
+from core.rules import Rules
+from core.shapes import shapes, RUN, FREE_THREE, FREE_FOUR
+from ui.stones import Stones
+
+
+def test_shape_entries(make_cfg):
+	cfg = make_cfg()
+	black, white = cfg.colour.black, cfg.colour.white
+	stones = Stones(cfg)
+	# row 9: X X [ ] X with empty ends is a free four, column 8: X [ ] _ X a free three
+	for tile in [(6, 9), (7, 9), (9, 9), (8, 7), (8, 11)]:
+		stones.place(Move(tile, black))
+	entries = shapes(stones, (8, 9), black)
+	assert sorted(e & RUN for e in entries) == [1, 1, 1, 4]
+	assert sum(bool(e & FREE_FOUR) for e in entries) == 1
+	assert sum(bool(e & FREE_THREE) for e in entries) == 1
+
+	# a white stone at one end closes the four
+	stones.place(Move((5, 9), white))
+	assert not any(e & FREE_FOUR for e in shapes(stones, (8, 9), black))
+
+
+def test_double_three_and_overline(make_cfg):
+	cfg = make_cfg(difficulty="pro", no_double_threes=True)
+	rules = Rules(cfg)
+	black, white = cfg.colour.black, cfg.colour.white
+	stones = Stones(cfg)
+	# (9, 9) would make free threes on row 9 and column 9
+	for tile in [(7, 9), (8, 9), (9, 7), (9, 8)]:
+		stones.place(Move(tile, black))
+	assert rules.validateMove(stones, Move((9, 9), black)) == (False, "Black cannot create double-three!")
+	assert rules.countFreeThrees(stones, Move((9, 9), black)) == 2
+	assert rules.validateMove(stones, Move((9, 9), white)) == (True, None)
+
+	# X X X [ ] X X: six in a row for black
+	stones = Stones(cfg)
+	for tile in [(3, 3), (4, 3), (5, 3), (7, 3), (8, 3)]:
+		stones.place(Move(tile, black))
+	assert rules.validateMove(stones, Move((6, 3), black)) == (False, "Black cannot create overline (6+)!")
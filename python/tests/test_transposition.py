@@ -0,0 +1,91 @@
+from config import Config
+from core.move import Move
+from core.transposition import TranspositionTable, EXACT, LOWER, UPPER
+from ui.stones import Stones
+
+
+def test_hash_is_order_independent():
+	cfg = Config()
+	black, white = cfg.colour.black, cfg.colour.white
+
+	a = Stones(cfg)
+	a.place(Move((3, 3), black))
+	a.place(Move((4, 4), white))
+	a.place(Move((5, 5), black))
+
+	b = Stones(cfg)
+	b.place(Move((5, 5), black))
+	b.place(Move((4, 4), white))
+	b.place(Move((3, 3), black))
+	assert a.hash == b.hash
+
+	b.remove([Move((5, 5), black)])
+	assert a.hash != b.hash
+	b.place(Move((5, 5), black))
+	assert a.hash == b.hash
+
+	# same stones, different colour on a tile
+	c = Stones(cfg)
+	c.place(Move((3, 3), black))
+	c.place(Move((4, 4), black))
+	c.place(Move((5, 5), black))
+	assert a.hash != c.hash
+
+
+def test_hash_covers_captures():
+	cfg = Config()
+	black = cfg.colour.black
+
+	a = Stones(cfg)
+	a.place(Move((3, 3), black))
+	b = a.copy()
+	assert a.hash == b.hash
+
+	b.addCaptures(black, 2)
+	assert a.hash != b.hash
+	a.addCaptures(black, 1)
+	a.addCaptures(black, 1)
+	assert a.hash == b.hash
+
+
+def test_depth_preferred_replacement():
+	tt = TranspositionTable(1)
+
+	tt.store(10, 4, EXACT, 5, (1, 1))
+	# shallower entry for a different key does not evict a deeper one
+	tt.store(11, 2, LOWER, 7, (2, 2))
+	assert tt.probe(10).score == 5
+	assert tt.probe(11) is None
+
+	tt.store(11, 5, UPPER, 7, (2, 2))
+	assert tt.probe(10) is None
+	assert tt.probe(11).flag == UPPER
+	assert len(tt) == 1
+
+	# entries from an older search can always be replaced
+	tt.newSearch()
+	tt.store(12, 1, EXACT, 0, (3, 3))
+	assert tt.probe(12).tile == (3, 3)
+
+
+def test_make_unmake_restores_position():
+	cfg = Config()
+	black, white = cfg.colour.black, cfg.colour.white
+
+	stones = Stones(cfg)
+	stones.place(Move((5, 5), black))
+	stones.place(Move((6, 5), white))
+	stones.place(Move((7, 5), white))
+	before_map, before_hash = dict(stones.map), stones.hash
+
+	stones.make(Move((9, 9), black))
+	capture = Move((8, 5), black)
+	stones.make(capture, [Move((6, 5), white), Move((7, 5), white)])
+	assert (6, 5) not in stones.map and (7, 5) not in stones.map
+	assert stones.captures[black] == 2
+
+	stones.unmake()
+	stones.unmake()
+	assert stones.map == before_map
+	assert stones.hash == before_hash
+	assert stones.captures.get(black, 0) == 0
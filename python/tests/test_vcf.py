@@ -0,0 +1,88 @@
+from core.rules import Rules
+from core.move import Move
+from core.vcf import VCF
+from ui.stones import Stones
+
+
+def test_vcf_finds_forced_win(make_cfg):
+	cfg = make_cfg(size=15)
+	rules = Rules(cfg)
+	vcf = VCF(cfg, rules)
+	black, white = cfg.colour.black, cfg.colour.white
+
+	# two closed threes sharing (7, 7): each four is blocked, the last one is double
+	stones = Stones(cfg)
+	for tile in [(4, 7), (5, 7), (6, 7), (7, 4), (7, 5), (7, 6)]:
+		stones.place(Move(tile, black))
+	for tile in [(3, 7), (7, 3), (0, 0), (14, 14), (0, 14), (14, 0)]:
+		stones.place(Move(tile, white))
+
+	line = vcf.solve(stones, black, white)
+	assert line is not None
+	assert line[0] == (7, 7)
+	assert vcf.forcedMove(stones, black, white) == (float('inf'), (7, 7))
+
+
+def test_vcf_refutes_blocked_threes(make_cfg):
+	cfg = make_cfg(size=15)
+	rules = Rules(cfg)
+	vcf = VCF(cfg, rules)
+	black, white = cfg.colour.black, cfg.colour.white
+
+	stones = Stones(cfg)
+	for tile in [(4, 7), (5, 7), (6, 7)]:
+		stones.place(Move(tile, black))
+	for tile in [(3, 7), (8, 7)]:
+		stones.place(Move(tile, white))
+
+	assert vcf.solve(stones, black, white) is None
+
+
+def test_forced_move_blocks_four(make_cfg):
+	cfg = make_cfg(size=15)
+	rules = Rules(cfg)
+	vcf = VCF(cfg, rules)
+	black, white = cfg.colour.black, cfg.colour.white
+
+	stones = Stones(cfg)
+	for tile in [(4, 7), (5, 7), (6, 7), (7, 7)]:
+		stones.place(Move(tile, white))
+	stones.place(Move((3, 7), black))
+	stones.place(Move((10, 10), black))
+
+	assert vcf.forcedMove(stones, black, white) == (0, (8, 7))
+
+
+def test_forced_move_skips_a_forbidden_block(make_cfg):
+	cfg = make_cfg(size=15, no_double_threes=True)
+	rules = Rules(cfg)
+	vcf = VCF(cfg, rules)
+	black, white = cfg.colour.black, cfg.colour.white
+
+	stones = Stones(cfg)
+	for tile in [(4, 7), (5, 7), (6, 7), (7, 7)]:
+		stones.place(Move(tile, white))
+	stones.place(Move((3, 7), black))
+	# blocking on (8, 7) would make two free threes for black
+	for tile in [(8, 5), (8, 6), (6, 5), (7, 6)]:
+		stones.place(Move(tile, black))
+
+	assert not rules.validateMove(stones, Move((8, 7), black))[0]
+	assert vcf.forcedMove(stones, black, white) is None
+
+
+def test_capture_win_breaks_four(make_cfg):
+	cfg = make_cfg(size=15, difficulty="ninuki")
+	vcf = VCF(cfg, Rules(cfg))
+	black, white = cfg.colour.black, cfg.colour.white
+
+	stones = Stones(cfg)
+	for tile in [(1, 7), (2, 7), (3, 7), (4, 7), (10, 10), (11, 10)]:
+		stones.place(Move(tile, black))
+	stones.place(Move((9, 10), white))
+	stones.addCaptures(white, 8)
+
+	# taking the pair away from the four only matters if it wins the game
+	assert vcf._canBreak(stones, [(5, 7)], black, white)
+	cfg.game.captureWinCount = 12
+	assert not vcf._canBreak(stones, [(5, 7)], black, white)
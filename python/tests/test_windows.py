@@ -0,0 +1,83 @@
+import random
+from config import Config
+from core.move import Move
+from core.rules import Rules
+from core.windows import windows, WEIGHTS
+from core.batch import BatchEvaluator
+from ui.stones import Stones
+
+
+def brute_lines(stones, colour):
+	"""stone counts of colour's live windows, by scanning every window"""
+	return [
+		sum(stones.map.get(t) == colour for t in window)
+		for window in windows(stones.cfg.board.size)
+		if all(stones.map.get(t) in (None, colour) for t in window)
+	]
+
+
+def test_windows_follow_place_and_remove():
+	cfg = Config()
+	cfg.board.size = 9
+	black, white = cfg.colour.black, cfg.colour.white
+	stones = Stones(cfg)
+	rng = random.Random(0)
+
+	for _ in range(500):
+		tile = (rng.randrange(9), rng.randrange(9))
+		if tile in stones.map and rng.random() < 0.5:
+			stones.remove([Move(tile, stones.map[tile])])
+		else:
+			stones.place(Move(tile, rng.choice([black, white])))
+
+	for board in (stones, stones.copy()):
+		for colour in (black, white):
+			side = board.windows.side(colour)
+			lines = brute_lines(board, colour)
+			assert board.windows.score(side) == sum(WEIGHTS[k] for k in lines)
+			assert [board.windows.count(side, k) for k in range(1, 6)] == [lines.count(k) for k in range(1, 6)]
+
+
+def test_evaluate_reads_the_windows(make_cfg):
+	cfg = make_cfg()
+	black, white = cfg.colour.black, cfg.colour.white
+	rules = Rules(cfg)
+
+	stones = Stones(cfg)
+	stones.make(Move((9, 9), white))
+	last = Move((3, 3), black)
+	stones.make(last)
+	# a lone stone in the middle lies in 20 live windows, one in the corner area in fewer
+	assert rules.evaluate(stones, white, last) == 20 - 2 * stones.windows.score(stones.windows.side(black))
+
+	# black's open three: two live windows of three
+	stones.make(Move((9, 10), white))
+	stones.make(Move((4, 3), black))
+	stones.make(Move((9, 11), white))
+	last = Move((5, 3), black)
+	stones.make(last)
+	assert rules.evaluate(stones, white, last) == -1e6
+
+
+def test_batch_scores_match_evaluate(make_cfg):
+	cfg = make_cfg(size=15, difficulty="ninuki")
+	black, white = cfg.colour.black, cfg.colour.white
+	rules = Rules(cfg)
+	batch = BatchEvaluator(cfg, rules)
+	rng = random.Random(1)
+
+	stones = Stones(cfg)
+	colour = black
+	stones.addCaptures(white, 2)
+	for _ in range(20):
+		move = Move(rng.choice(sorted(stones.frontier) or [(7, 7)]), colour)
+		stones.make(move, rules.previewCaptures(stones, move))
+		colour = white if colour == black else black
+
+	scores = batch.scores(stones, sorted(stones.frontier), colour, white)
+	assert scores
+	for tile, score in scores.items():
+		move = Move(tile, colour)
+		stones.make(move, rules.previewCaptures(stones, move))
+		assert rules.evaluate(stones, white, move) == score
+		stones.unmake()
@@ -19,7 +19,7 @@ def main_menu(self):
             menu.add.selector('Board Size : ', [('(19x19)', 19), ('(15x15)', 15), ('(13x13)', 13), ('(11x11)', 11), ('(9x9)', 9), ('(7x7)', 7), ('(5x5)', 5)], selector_id='board_size')
             menu.add.selector(f'P1 ({self.cfg.game.player1Name}) : ', [(f'{self.cfg.game.humanName}', 1), (f'{self.cfg.game.aiName}', 2)], selector_id='player1')
             menu.add.selector(f'P2 ({self.cfg.game.player2Name}) : ', [(f'{self.cfg.game.humanName}', 1), (f'{self.cfg.game.aiName}', 2)], selector_id='player2')
-            menu.add.selector('AI Type : ', [('Minmax', 'minmax'), ('Random', 'random')], selector_id='ai_type')
+            menu.add.selector('AI Type : ', [('Minmax', 'minmax'), ('MCTS', 'mcts'), ('Random', 'random')], selector_id='ai_type')
             menu.add.selector('No Double-Threes : ', [('Off', False), ('On', True)], selector_id='no_double_threes')
             menu.add.button('Play', menu.disable)
             menu.add.button('Explain Rules', self._show_rules)
@@ -1,8 +1,13 @@
 import pygame
 from core.utils import *
 from core.move import Move
+from core.zobrist import tileKey, captureKey
+from core.symmetry import symmetricKeys
+from core.windows import FiveWindows
+from core.bitboard import BitBoard
+from core.geometry import allTiles, neighbours
+from core.captures import CaptureIndex
 from config import Config
-from itertools import product
 
 
 class Stones:
@@ -10,33 +15,139 @@ def __init__(self, cfg):
 		self.cfg = cfg
 		self.map = {}
 		self.shadow = None
-		
-		lst = list(range(0, self.cfg.board.size))
-		self.allMoves = [c for c in product(lst, repeat=2)]
+		self.captures = {}
+		self.hash = 0
+		self.symHashes = [0] * 8
+		self._undo = []
+		self.radius = self.cfg.game.aiFrontierRadius.get(self.cfg.board.size, 1)
+		self.near = {}
+		self.frontier = set()
+		self.windows = FiveWindows(self.cfg.board.size)
+		# optional second representation the rules read runs, shapes and captures from
+		self.bits = BitBoard(self.cfg.board.size) if self.cfg.game.boardBackend == "bitboard" else None
+		self.allMoves = allTiles(self.cfg.board.size)
+		# capturable pairs, in the variants that have captures
+		capture_variant = getattr(self.cfg.game, "difficulty", None) in ["ninuki", "pente"]
+		self.threats = CaptureIndex(self.cfg.board.size) if capture_variant else None
 
 
 	def copy(self):
 		new_stones = Stones(self.cfg)
 		new_stones.map = self.map.copy()
+		new_stones.captures = self.captures.copy()
+		new_stones.hash = self.hash
+		new_stones.symHashes = self.symHashes.copy()
+		new_stones.near = self.near.copy()
+		new_stones.frontier = self.frontier.copy()
+		new_stones.windows = self.windows.copy()
+		new_stones.bits = self.bits.copy() if self.bits is not None else None
+		new_stones.threats = self.threats.copy() if self.threats is not None else None
 		return new_stones
 
 
 	def place(self, move, colour=None):
 		"""Place a stone. Accepts either a Move object or (tile, colour) tuple."""
 		if isinstance(move, Move):
-			self.map[move.tile] = move.colour
+			tile, colour = move.tile, move.colour
 		else:
-			self.map[move] = colour
+			tile = move
+		old = self.map.get(tile)
+		if old is not None:
+			self.hash ^= tileKey(tile, old)
+			self._xorSymmetric(tile, old)
+			self.windows.remove(tile, old)
+			if self.bits is not None:
+				self.bits.toggle(tile, old)
+		else:
+			self._occupy(tile)
+		self.map[tile] = colour
+		self.hash ^= tileKey(tile, colour)
+		self._xorSymmetric(tile, colour)
+		self.windows.add(tile, colour)
+		if self.bits is not None:
+			self.bits.toggle(tile, colour)
+		if self.threats is not None:
+			self.threats.update(self.map, tile)
 
 
 	def remove(self, moves: list[Move]):
 		for move in moves:
+			self.hash ^= tileKey(move.tile, self.map[move.tile])
+			self._xorSymmetric(move.tile, self.map[move.tile])
+			self.windows.remove(move.tile, self.map[move.tile])
+			if self.bits is not None:
+				self.bits.toggle(move.tile, self.map[move.tile])
 			del self.map[move.tile]
+			self._vacate(move.tile)
+			if self.threats is not None:
+				self.threats.update(self.map, move.tile)
+
+
+	def make(self, move: Move, captures: list[Move] = ()):
+		"""Play a move in place and remove the stones it captures. Undo with unmake()"""
+		self.place(move)
+		if captures:
+			self.remove(captures)
+			self.addCaptures(move.colour, len(captures))
+		self._undo.append((move, captures))
+
+
+	def unmake(self):
+		"""Take back the last make(), restoring any captured stones"""
+		move, captures = self._undo.pop()
+		if captures:
+			self.addCaptures(move.colour, -len(captures))
+			for captured in captures:
+				self.place(captured)
+		self.remove([move])
+
+
+	def lastMoves(self, count):
+		"""The last count (move, captures) pairs made, oldest first"""
+		return self._undo[-count:]
+
+
+	def addCaptures(self, colour, count):
+		"""Record stones captured by colour; capture counts are part of the hash"""
+		old = self.captures.get(colour, 0)
+		self.hash ^= captureKey(colour, old) ^ captureKey(colour, old + count)
+		self.captures[colour] = old + count
+
+
+	def _xorSymmetric(self, tile, colour):
+		"""Toggle colour on tile in the hashes of the 8 orientations of the board"""
+		hashes = self.symHashes
+		for t, key in enumerate(symmetricKeys(tile, colour, self.cfg.board.size)):
+			hashes[t] ^= key
+
+
+	def _occupy(self, tile):
+		"""Frontier bookkeeping for a stone landing on an empty tile"""
+		self.frontier.discard(tile)
+		near, frontier, occupied = self.near, self.frontier, self.map
+		for n in neighbours(self.cfg.board.size, self.radius)[tile]:
+			near[n] = near.get(n, 0) + 1
+			if n not in occupied:
+				frontier.add(n)
+
+
+	def _vacate(self, tile):
+		"""Frontier bookkeeping for a stone leaving tile (map already updated)"""
+		near, frontier = self.near, self.frontier
+		for n in neighbours(self.cfg.board.size, self.radius)[tile]:
+			if near[n] == 1:
+				del near[n]
+				frontier.discard(n)
+			else:
+				near[n] -= 1
+		if tile in near:
+			frontier.add(tile)
 
 
 	def addShadow(self, move: Move):
 		self.shadow = move
 
-	
+
 	def isFull(self):
-		return len(self.map) == len(self.allMoves)
\ No newline at end of file
+		return len(self.map) == len(self.allMoves)
+